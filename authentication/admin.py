@@ -12,6 +12,7 @@ class CustomUserAdmin(UserAdmin):
     list_filter = ['is_verified', 'is_staff', 'is_active', 'date_joined', 'last_download']
     search_fields = ['email', 'username', 'first_name', 'last_name']
     ordering = ['-date_joined']
+    list_select_related = True
     
     fieldsets = UserAdmin.fieldsets + (
         ('Additional Info', {
@@ -27,4 +28,7 @@ class CustomUserAdmin(UserAdmin):
         ('Additional Info', {
             'fields': ('email', 'first_name', 'last_name', 'bio')
         }),
-    )
\ No newline at end of file
+    )
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).prefetch_related('groups', 'user_permissions')
@@ -4,3 +4,26 @@ from django.apps import AppConfig
 class AuthenticationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'authentication'
+
+    def ready(self):
+        from django.conf import settings
+        from django.contrib.auth.password_validation import get_default_password_validators
+        from django.core.exceptions import ImproperlyConfigured
+
+        # Checked here rather than in settings, so test settings can swap in
+        # local caches before it applies
+        if settings.SHARED_CACHES_REQUIRED and not settings.REDIS_DURABLE_URL:
+            raise ImproperlyConfigured(
+                "REDIS_DURABLE_URL must be set when DEBUG is off: download rate "
+                "limits and post view counts need a cache shared by all workers "
+                "that doesn't evict them."
+            )
+        if settings.REDIS_DURABLE_URL and settings.REDIS_DURABLE_URL == settings.REDIS_URL:
+            raise ImproperlyConfigured(
+                "REDIS_DURABLE_URL must be a different database from REDIS_URL, "
+                "or clearing the default cache would wipe it."
+            )
+
+        # Build the validators (and CommonPasswordValidator's word list) at
+        # startup instead of on the first registration request
+        get_default_password_validators()
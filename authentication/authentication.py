@@ -0,0 +1,85 @@
+# ===== authentication/authentication.py =====
+from functools import lru_cache
+from django.utils.translation import gettext_lazy as _
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from drf_spectacular.drainage import set_override
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import aware_utcnow, get_md5_hash_password
+from .models import CustomUser
+
+# Validated access tokens kept per process; a client sends the same token on
+# every request until it expires
+VALIDATED_TOKEN_CACHE_SIZE = 1024
+
+@lru_cache(maxsize=VALIDATED_TOKEN_CACHE_SIZE)
+def validated_token(raw_token):
+    return JWTAuthentication().get_validated_token(raw_token)
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that decodes and verifies each access token once per
+    process. The user is still loaded per request, so deactivation and
+    password changes apply immediately.
+    """
+    
+    def get_validated_token(self, raw_token):
+        token = validated_token(raw_token)
+        try:
+            # The cache has no TTL; the token's own expiry is its lifetime.
+            # check_exp() defaults to the time the token was decoded.
+            token.check_exp(current_time=aware_utcnow())
+        except TokenError:
+            # Raise the usual InvalidToken
+            return super().get_validated_token(raw_token)
+        return token
+
+class ProfileJWTAuthentication(CachedJWTAuthentication):
+    """
+    JWT authentication that loads the user with their profile counts, so the
+    profile endpoint is served from the authentication query alone
+    """
+    
+    def get_user(self, validated_token):
+        """
+        Same checks as JWTAuthentication.get_user, on the annotated queryset
+        """
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+        
+        try:
+            user = CustomUser.objects.with_profile_counts().get(
+                **{api_settings.USER_ID_FIELD: user_id}
+            )
+        except CustomUser.DoesNotExist as e:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+        
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+        
+        return user
+
+class CachedJWTScheme(SimpleJWTScheme):
+    """
+    Document CachedJWTAuthentication as the same bearer JWT scheme
+    """
+    target_class = CachedJWTAuthentication
+
+class ProfileJWTScheme(SimpleJWTScheme):
+    """
+    Document ProfileJWTAuthentication as the same bearer JWT scheme
+    """
+    target_class = ProfileJWTAuthentication
+
+# The authenticators share the "jwtAuth" security scheme on purpose
+set_override(CachedJWTAuthentication, 'suppress_collision_warning', True)
+set_override(ProfileJWTAuthentication, 'suppress_collision_warning', True)
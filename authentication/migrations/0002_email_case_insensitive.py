@@ -0,0 +1,32 @@
+# Generated by Django 5.2.5 on 2026-10-15 22:35
+
+import authentication.models
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+def lowercase_emails(apps, schema_editor):
+    CustomUser = apps.get_model('authentication', 'CustomUser')
+    CustomUser.objects.update(email=django.db.models.functions.text.Lower('email'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('authentication', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name='customuser',
+            managers=[
+                ('objects', authentication.models.CustomUserManager()),
+            ],
+        ),
+        migrations.RunPython(lowercase_emails, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='customuser',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('email'), name='uniq_email_ci'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-15 22:44
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0004_avatar_dimensions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='full_name',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.text.Trim(django.db.models.functions.text.Concat('first_name', models.Value(' '), 'last_name')), output_field=models.CharField(max_length=61)),
+        ),
+    ]
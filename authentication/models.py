@@ -1,7 +1,38 @@
 # ===== authentication/models.py =====
-from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import AbstractUser, UserManager
 from django.db import models
+from django.db.models import Count, F, Q, Value
+from django.db.models.functions import Concat, Lower, Trim
 from django.utils import timezone
+from . import ratelimit
+
+class CustomUserManager(UserManager):
+    """
+    User manager that looks users up by their normalized (lowercase) email
+    and skips profile-only fields that most requests never read
+    """
+    # Loaded lazily on access; use .defer(None) when serializing profiles
+    DEFERRED_FIELDS = ('bio', 'avatar', 'date_of_birth')
+    
+    def get_queryset(self):
+        return super().get_queryset().defer(*self.DEFERRED_FIELDS)
+    
+    def get_by_natural_key(self, username):
+        return super().get_by_natural_key(username.lower())
+    
+    def with_profile_counts(self):
+        """
+        Users with every profile field loaded and their published post and
+        comment counts annotated, as UserProfileSerializer expects
+        """
+        return self.get_queryset().defer(None).annotate(
+            posts_count=Count(
+                'blog_posts',
+                filter=Q(blog_posts__status='published'),
+                distinct=True
+            ),
+            comments_count=Count('comments', distinct=True)
+        )
 
 class CustomUser(AbstractUser):
     """
@@ -10,8 +41,21 @@ class CustomUser(AbstractUser):
     email = models.EmailField(unique=True)
     first_name = models.CharField(max_length=30, blank=True)
     last_name = models.CharField(max_length=30, blank=True)
+    full_name = models.GeneratedField(
+        expression=Trim(Concat('first_name', Value(' '), 'last_name')),
+        output_field=models.CharField(max_length=61),
+        db_persist=True
+    )
     bio = models.TextField(max_length=500, blank=True)
-    avatar = models.ImageField(upload_to='avatars/', null=True, blank=True)
+    avatar = models.ImageField(
+        upload_to='avatars/',
+        null=True,
+        blank=True,
+        width_field='avatar_width',
+        height_field='avatar_height'
+    )
+    avatar_width = models.PositiveSmallIntegerField(null=True, blank=True, editable=False)
+    avatar_height = models.PositiveSmallIntegerField(null=True, blank=True, editable=False)
     date_of_birth = models.DateField(null=True, blank=True)
     is_verified = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -19,9 +63,11 @@ class CustomUser(AbstractUser):
   
     
     # Track API usage
-    last_download = models.DateTimeField(null=True, blank=True)
+    last_download = models.DateTimeField(null=True, blank=True, db_index=True)
     download_count = models.PositiveIntegerField(default=0)
     
+    objects = CustomUserManager()
+    
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username']
     
@@ -29,24 +75,57 @@ class CustomUser(AbstractUser):
         db_table = 'auth_user_custom'
         verbose_name = 'User'
         verbose_name_plural = 'Users'
+        indexes = [
+            models.Index(fields=['is_verified', 'last_download']),
+            models.Index(fields=['download_count']),
+        ]
+        constraints = [
+            # Guards writes that bypass save(), e.g. queryset.update()
+            models.UniqueConstraint(Lower('email'), name='uniq_email_ci'),
+        ]
     
     def __str__(self):
         return self.email
     
+    def save(self, *args, **kwargs):
+        # Store emails lowercase so exact lookups hit the unique index
+        if self.email:
+            self.email = self.email.lower()
+        super().save(*args, **kwargs)
+        
+        # full_name is computed by the database; keep the in-memory copy current
+        self.full_name = self.get_full_name()
+    
     def get_full_name(self):
         return f"{self.first_name} {self.last_name}".strip()
     
-    def can_download(self):
+    def can_download(self, cost=1):
         """Check if user can download based on rate limiting"""
-        if not self.last_download:
-            return True
-        
-        time_diff = timezone.now() - self.last_download
-        # Allow download if last download was more than 1 hour ago
-        return time_diff.total_seconds() > 3600
+        return ratelimit.can_download(self.pk, cost)
+    
+    def consume_download(self, cost=1):
+        """
+        Use up rate-limited downloads before starting one; False if the
+        user is over the limit
+        """
+        return ratelimit.try_consume(self.pk, cost)
+    
+    def refund_download(self, cost=1):
+        """Give back downloads used by a request that was refused or failed"""
+        ratelimit.refund(self.pk, cost)
+    
+    def download_retry_after(self, cost=1):
+        """Seconds until the user can download again"""
+        return ratelimit.retry_after(self.pk, cost)
     
     def increment_download_count(self):
-        """Track download usage"""
+        """Track a completed download"""
+        now = timezone.now()
+        
+        # Atomic UPDATE so concurrent downloads don't lose increments
+        CustomUser.objects.filter(pk=self.pk).update(
+            download_count=F('download_count') + 1,
+            last_download=now
+        )
         self.download_count += 1
-        self.last_download = timezone.now()
-        self.save(update_fields=['download_count', 'last_download'])
\ No newline at end of file
+        self.last_download = now
\ No newline at end of file
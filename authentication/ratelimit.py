@@ -0,0 +1,120 @@
+# ===== authentication/ratelimit.py =====
+import math
+import threading
+import time
+from django.core.cache import caches
+from django.core.cache.backends.redis import RedisCache
+
+# Token bucket for downloads: bursts up to capacity, refilled one per hour
+BUCKET_CAPACITY = 3
+REFILL_RATE = 1 / 3600  # tokens per second
+BUCKET_KEY_FORMAT = 'token_bucket:%s'
+
+# An untouched bucket is full again after this long, so the entry can expire
+BUCKET_TIMEOUT = math.ceil(BUCKET_CAPACITY / REFILL_RATE)
+
+# Refills the bucket and takes ARGV[4] tokens if there are that many (a
+# negative cost gives them back), in one atomic step on the Redis server.
+# Returns whether they were taken and the tokens left, as a string so Redis
+# doesn't truncate it to an integer.
+TAKE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'refilled_at')
+local tokens = tonumber(state[1]) or capacity
+local refilled_at = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - refilled_at) * rate)
+local taken = 0
+if tokens >= cost then
+    tokens = math.min(capacity, tokens - cost)
+    taken = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'refilled_at', tostring(now))
+redis.call('EXPIRE', KEYS[1], ARGV[5])
+return {taken, tostring(tokens)}
+"""
+
+# Serializes bucket updates for caches without server-side scripts; those are
+# local to the process, so a process-wide lock makes the update atomic
+_local_lock = threading.Lock()
+
+
+def _refilled(tokens, refilled_at, now):
+    return min(BUCKET_CAPACITY, tokens + max(0.0, now - refilled_at) * REFILL_RATE)
+
+
+def _take(user_id, cost):
+    """
+    Atomically refill the user's bucket and take `cost` tokens if it holds
+    that many. Returns whether they were taken and the tokens left.
+    """
+    cache = caches['ratelimit']
+    key = BUCKET_KEY_FORMAT % user_id
+    now = time.time()
+
+    if isinstance(cache, RedisCache):
+        key = cache.make_and_validate_key(key)
+        client = cache._cache.get_client(key, write=True)
+        # Run by its SHA (EVALSHA); loaded onto the server on first use
+        taken, tokens = client.register_script(TAKE_SCRIPT)(
+            keys=[key], args=[BUCKET_CAPACITY, REFILL_RATE, now, cost, BUCKET_TIMEOUT]
+        )
+        return bool(taken), float(tokens)
+
+    with _local_lock:
+        tokens = _refilled(*cache.get(key, (BUCKET_CAPACITY, now)), now)
+        taken = tokens >= cost
+        if taken:
+            tokens = min(BUCKET_CAPACITY, tokens - cost)
+        cache.set(key, (tokens, now), BUCKET_TIMEOUT)
+    return taken, tokens
+
+
+def _peek(user_id):
+    """
+    Return the refilled token count for a user's bucket, without changing it
+    """
+    cache = caches['ratelimit']
+    key = BUCKET_KEY_FORMAT % user_id
+    now = time.time()
+
+    if isinstance(cache, RedisCache):
+        key = cache.make_and_validate_key(key)
+        client = cache._cache.get_client(key)
+        tokens, refilled_at = client.hmget(key, 'tokens', 'refilled_at')
+        if tokens is None:
+            return float(BUCKET_CAPACITY)
+        return _refilled(float(tokens), float(refilled_at), now)
+
+    return _refilled(*cache.get(key, (BUCKET_CAPACITY, now)), now)
+
+
+def can_download(user_id, cost=1):
+    """
+    Check if the user has enough tokens for a download, without taking them
+    """
+    return _peek(user_id) >= cost
+
+
+def try_consume(user_id, cost=1):
+    """
+    Take tokens for a download before it starts. Returns False, taking
+    nothing, if the user doesn't have enough.
+    """
+    return _take(user_id, cost)[0]
+
+
+def refund(user_id, cost=1):
+    """
+    Give back tokens taken for a download that was refused or failed
+    """
+    _take(user_id, -cost)
+
+
+def retry_after(user_id, cost=1):
+    """
+    Seconds until the user's bucket holds `cost` tokens again
+    """
+    return max(0, math.ceil((cost - _peek(user_id)) / REFILL_RATE))
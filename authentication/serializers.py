@@ -4,46 +4,85 @@
 from rest_framework import serializers
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from django.contrib.auth import authenticate
+from django.contrib.auth.validators import UnicodeUsernameValidator
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
+from django.db.models import Count, Q
+from copy import deepcopy
+from functools import lru_cache
+from types import MappingProxyType
+import time
 from .models import CustomUser
 
+# How long, in seconds, a memoized token response user info is reused
+USER_INFO_TTL = 30
+
+@lru_cache(maxsize=4096)
+def _build_user_info(ttl_window, username, email, first_name, last_name, is_verified):
+    """
+    Memoized user info for token responses. Every input is part of the cache
+    key, so entries can't go stale, and so is the current USER_INFO_TTL
+    window, so none is reused after it; old windows' entries are the least
+    recently used and are evicted first. The mapping is read-only as it's
+    shared.
+    """
+    return MappingProxyType({
+        'username': username,
+        'email': email,
+        'full_name': f"{first_name} {last_name}".strip(),
+        'is_verified': is_verified,
+    })
+
+class CachedFieldsMixin:
+    """
+    Build a ModelSerializer's fields once per class and give each instance a
+    copy, instead of introspecting the model on every request
+    """
+    
+    def get_fields(self):
+        cls = type(self)
+        fields = cls.__dict__.get('_cached_fields')
+        if fields is None:
+            fields = super().get_fields()
+            cls._cached_fields = fields
+        return deepcopy(fields)
+
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     """
     Custom JWT token serializer that includes additional user info
     """
     
+    @staticmethod
+    def get_user_info(user):
+        """User details shared by the token claims and the login response"""
+        return _build_user_info(
+            int(time.monotonic() // USER_INFO_TTL),
+            user.username, user.email, user.first_name, user.last_name, user.is_verified
+        )
+    
     @classmethod
     def get_token(cls, user):
         token = super().get_token(user)
         
         # Add custom claims
-        token['username'] = user.username
-        token['email'] = user.email
-        token['is_verified'] = user.is_verified
-        token['full_name'] = user.get_full_name()
+        token.payload.update(cls.get_user_info(user))
         
         return token
     
     def validate(self, attrs):
         data = super().validate(attrs)
         
-        # Add extra responses here
-        data['user'] = {
-            'id': self.user.id,
-            'username': self.user.username,
-            'email': self.user.email,
-            'full_name': self.user.get_full_name(),
-            'is_verified': self.user.is_verified,
-        }
+        # Add extra responses here; get_user_info() is memoized, so this is
+        # the mapping get_token() already built
+        data['user'] = {'id': self.user.id, **self.get_user_info(self.user)}
         
         return data
 
-class UserRegistrationSerializer(serializers.ModelSerializer):
+class UserRegistrationSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for user registration with validation
     """
-    password = serializers.CharField(write_only=True, validators=[validate_password])
+    password = serializers.CharField(write_only=True)
     password_confirm = serializers.CharField(write_only=True)
     
     class Meta:
@@ -52,32 +91,57 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
             'username', 'email', 'password', 'password_confirm',
             'first_name', 'last_name', 'bio', 'date_of_birth'
         ]
+        # Uniqueness is checked in validate() with a single query instead of
+        # one UniqueValidator query per field
         extra_kwargs = {
-            'email': {'required': True},
+            'email': {'required': True, 'validators': []},
+            'username': {'validators': [UnicodeUsernameValidator()]},
             'first_name': {'required': False},
             'last_name': {'required': False},
         }
     
     def validate_email(self, value):
-        """Validate email uniqueness"""
-        if CustomUser.objects.filter(email=value).exists():
-            raise serializers.ValidationError("A user with this email already exists.")
-        return value
+        """Normalize email so the uniqueness check matches stored values"""
+        return value.lower()
     
     def validate_username(self, value):
-        """Validate username uniqueness and format"""
-        if CustomUser.objects.filter(username=value).exists():
-            raise serializers.ValidationError("A user with this username already exists.")
-        
+        """Validate username format"""
         if len(value) < 3:
             raise serializers.ValidationError("Username must be at least 3 characters long.")
         
         return value
     
     def validate(self, attrs):
-        """Validate password confirmation"""
+        """Validate password confirmation, email/username uniqueness and strength"""
         if attrs['password'] != attrs['password_confirm']:
             raise serializers.ValidationError("Password and password confirmation do not match.")
+        
+        existing = CustomUser.objects.filter(
+            Q(email=attrs['email']) | Q(username=attrs['username'])
+        ).values_list('email', 'username')[:2]
+        
+        errors = {}
+        for email, username in existing:
+            if email == attrs['email']:
+                errors['email'] = "A user with this email already exists."
+            if username == attrs['username']:
+                errors['username'] = "A user with this username already exists."
+        
+        if errors:
+            raise serializers.ValidationError(errors)
+        
+        # Run the expensive password validators only once cheaper checks pass
+        user = CustomUser(
+            username=attrs['username'],
+            email=attrs['email'],
+            first_name=attrs.get('first_name', ''),
+            last_name=attrs.get('last_name', '')
+        )
+        try:
+            validate_password(attrs['password'], user=user)
+        except ValidationError as e:
+            raise serializers.ValidationError({'password': e.messages})
+        
         return attrs
     
     def create(self, validated_data):
@@ -90,12 +154,18 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
             **validated_data
         )
         return user
+    
+    def to_representation(self, instance):
+        """Represent the new user in the profile shape"""
+        # A just-registered user has no posts or comments to count
+        instance.posts_count = instance.comments_count = 0
+        return UserProfileSerializer(instance, context=self.context).data
 
-class UserProfileSerializer(serializers.ModelSerializer):
+class UserProfileSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for user profile management
     """
-    full_name = serializers.CharField(source='get_full_name', read_only=True)
+    full_name = serializers.CharField(read_only=True)
     posts_count = serializers.SerializerMethodField()
     comments_count = serializers.SerializerMethodField()
     
@@ -103,23 +173,29 @@ class UserProfileSerializer(serializers.ModelSerializer):
         model = CustomUser
         fields = [
             'id', 'username', 'email', 'first_name', 'last_name',
-            'full_name', 'bio', 'avatar', 'date_of_birth', 
-            'is_verified', 'date_joined', 'posts_count', 
+            'full_name', 'bio', 'avatar', 'avatar_width', 'avatar_height',
+            'date_of_birth', 'is_verified', 'date_joined', 'posts_count', 
             'comments_count', 'download_count'
         ]
         read_only_fields = [
-            'id', 'username', 'email', 'is_verified', 
-            'date_joined', 'download_count'
+            'id', 'username', 'email', 'avatar_width', 'avatar_height',
+            'is_verified', 'date_joined', 'download_count'
         ]
     
     def get_posts_count(self, obj):
-        return obj.blog_posts.filter(status='published').count()
+        # Prefer a posts_count annotation, then a prefetched published_posts
+        # list, and only fall back to a COUNT query otherwise
+        posts_count = getattr(obj, 'posts_count', None)
+        if posts_count is not None:
+            return posts_count
+        
+        if hasattr(obj, 'published_posts'):
+            return len(obj.published_posts)
+        
+        return obj.blog_posts.filter(status='published').aggregate(c=Count('id'))['c']
     
     def get_comments_count(self, obj):
-        return obj.comments.count()
-    
-    def validate_bio(self, value):
-        """Validate bio length"""
-        if len(value) > 500:
-            raise serializers.ValidationError("Bio cannot exceed 500 characters.")
-        return value
+        comments_count = getattr(obj, 'comments_count', None)
+        if comments_count is None:
+            comments_count = obj.comments.aggregate(c=Count('id'))['c']
+        return comments_count
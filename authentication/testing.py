@@ -0,0 +1,25 @@
+# ===== authentication/testing.py =====
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class JWTAuthMixin:
+    """
+    Test case mixin providing get_auth_headers(user). Each user's access
+    token is signed once per test class and reused, as it outlives the class.
+    """
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Access tokens signed so far, by user pk
+        cls._tokens = {}
+    
+    @classmethod
+    def _token(cls, user):
+        token = cls._tokens.get(user.pk)
+        if token is None:
+            token = cls._tokens[user.pk] = str(RefreshToken.for_user(user).access_token)
+        return token
+    
+    def get_auth_headers(self, user):
+        """Get authentication headers for a user"""
+        return {'HTTP_AUTHORIZATION': f'Bearer {self._token(user)}'}
@@ -1,17 +1,24 @@
 from django.test import TestCase
 from django.contrib.auth import get_user_model
+from django.core.cache import caches
 from django.core.exceptions import ValidationError
-from django.utils import timezone
-from datetime import timedelta
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import IntegrityError, transaction
+from django.test import override_settings
 import tempfile
 import os
+import shutil
+import time
+from io import BytesIO
 from PIL import Image
+from authentication import ratelimit
 
 User = get_user_model()
 
 class CustomUserModelTest(TestCase):
     def setUp(self):
         """Set up test data"""
+        caches['ratelimit'].clear()
         self.user_data = {
             'email': 'test@example.com',
             'username': 'testuser',
@@ -75,23 +82,71 @@ class CustomUserModelTest(TestCase):
         user = User.objects.create_user(**user_data)
         self.assertEqual(user.get_full_name(), '')
 
+    def test_full_name_generated_column(self):
+        """Test that full_name is computed by the database"""
+        user = User.objects.create_user(**self.user_data)
+        self.assertEqual(User.objects.get(pk=user.pk).full_name, 'Test User')
+        
+        user.first_name = 'Updated'
+        user.save()
+        self.assertEqual(user.full_name, 'Updated User')
+        self.assertEqual(User.objects.get(pk=user.pk).full_name, 'Updated User')
+        
+        user.first_name = ''
+        user.save()
+        self.assertEqual(User.objects.get(pk=user.pk).full_name, 'User')
+
     def test_can_download_when_no_previous_download(self):
         """Test can_download when user has never downloaded"""
         user = User.objects.create_user(**self.user_data)
         self.assertTrue(user.can_download())
 
-    def test_can_download_after_time_limit(self):
-        """Test can_download after time limit has passed"""
+    def test_can_download_after_refill(self):
+        """Test can_download after the bucket has refilled"""
         user = User.objects.create_user(**self.user_data)
-        user.last_download = timezone.now() - timedelta(hours=2)
-        user.save()
+        caches['ratelimit'].set(ratelimit.BUCKET_KEY_FORMAT % user.pk, (0, time.time() - 7200))
         self.assertTrue(user.can_download())
 
-    def test_cannot_download_within_time_limit(self):
-        """Test can_download within time limit"""
+    def test_cannot_download_before_refill(self):
+        """Test can_download and retry_after while the bucket is empty"""
         user = User.objects.create_user(**self.user_data)
-        user.last_download = timezone.now() - timedelta(minutes=30)
-        user.save()
+        caches['ratelimit'].set(ratelimit.BUCKET_KEY_FORMAT % user.pk, (0, time.time() - 1800))
+        self.assertFalse(user.can_download())
+        self.assertAlmostEqual(user.download_retry_after(), 1800, delta=5)
+
+    def test_consume_download_burst_up_to_capacity(self):
+        """Test that downloads are allowed in bursts up to capacity, and refused without taking tokens after"""
+        user = User.objects.create_user(**self.user_data)
+        for _ in range(ratelimit.BUCKET_CAPACITY):
+            self.assertTrue(user.can_download())
+            self.assertTrue(user.consume_download())
+        self.assertFalse(user.can_download())
+        self.assertFalse(user.consume_download())
+        self.assertAlmostEqual(user.download_retry_after(), 3600, delta=5)
+
+    def test_consume_download_checks_and_counts_together(self):
+        """Test that a check made before another request consumes can't let both through"""
+        user = User.objects.create_user(**self.user_data)
+        other_request_user = User.objects.get(pk=user.pk)
+        for _ in range(ratelimit.BUCKET_CAPACITY - 1):
+            user.consume_download()
+        
+        # Both requests saw one download left; only one gets it
+        self.assertTrue(user.can_download() and other_request_user.can_download())
+        self.assertEqual([user.consume_download(), other_request_user.consume_download()], [True, False])
+
+    def test_refund_download(self):
+        """Test that refunded downloads can be used again, but never beyond capacity"""
+        user = User.objects.create_user(**self.user_data)
+        for _ in range(ratelimit.BUCKET_CAPACITY):
+            user.consume_download()
+        user.refund_download()
+        self.assertTrue(user.consume_download())
+        
+        for _ in range(ratelimit.BUCKET_CAPACITY + 1):
+            user.refund_download()
+        for _ in range(ratelimit.BUCKET_CAPACITY):
+            self.assertTrue(user.consume_download())
         self.assertFalse(user.can_download())
 
     def test_increment_download_count(self):
@@ -108,6 +163,17 @@ class CustomUserModelTest(TestCase):
         if initial_time is not None:
             self.assertGreater(user.last_download, initial_time)
 
+    def test_increment_download_count_with_stale_instance(self):
+        """Test that increments from stale instances are not lost"""
+        user = User.objects.create_user(**self.user_data)
+        stale_user = User.objects.get(pk=user.pk)
+        
+        user.increment_download_count()
+        stale_user.increment_download_count()
+        
+        user.refresh_from_db()
+        self.assertEqual(user.download_count, 2)
+
     def test_user_with_avatar(self):
         """Test user creation with avatar"""
         # Create a temporary image for testing
@@ -128,6 +194,23 @@ class CustomUserModelTest(TestCase):
             if os.path.exists(temp_image.name):
                 os.unlink(temp_image.name)
 
+    def test_avatar_dimensions_stored(self):
+        """Test that avatar dimensions are stored when the avatar is saved"""
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        
+        buffer = BytesIO()
+        Image.new('RGB', (120, 80), color='red').save(buffer, format='PNG')
+        avatar = SimpleUploadedFile('avatar.png', buffer.getvalue(), content_type='image/png')
+        
+        with override_settings(MEDIA_ROOT=media_root):
+            user = User.objects.create_user(**self.user_data)
+            user.avatar = avatar
+            user.save()
+        
+        dimensions = User.objects.values_list('avatar_width', 'avatar_height').get(pk=user.pk)
+        self.assertEqual(dimensions, (120, 80))
+
     def test_user_meta_options(self):
         """Test user model meta options"""
         user = User.objects.create_user(**self.user_data)
@@ -155,6 +238,46 @@ class CustomUserModelTest(TestCase):
                 password='testpass123'
             )
 
+    def test_email_normalized_to_lowercase(self):
+        """Test that email is stored lowercase"""
+        user_data = self.user_data.copy()
+        user_data['email'] = 'Test@Example.COM'
+        user = User.objects.create_user(**user_data)
+        user.refresh_from_db()
+        self.assertEqual(user.email, 'test@example.com')
+
+    def test_email_unique_case_insensitive(self):
+        """Test that uniq_email_ci rejects emails differing only in case, even past save()"""
+        User.objects.create_user(**self.user_data)
+        other_user = User.objects.create_user(
+            email='other@example.com',
+            username='anotheruser',
+            password='testpass123'
+        )
+        
+        # update() skips save()'s lowercasing, so only the constraint can catch it
+        with transaction.atomic(), self.assertRaises(IntegrityError):
+            User.objects.filter(pk=other_user.pk).update(email='TEST@example.com')
+        with transaction.atomic(), self.assertRaises(IntegrityError):
+            User.objects.bulk_create([User(email='TEST@example.com', username='thirduser')])
+
+    def test_get_by_natural_key_case_insensitive(self):
+        """Test that users can be looked up by email in any case"""
+        user = User.objects.create_user(**self.user_data)
+        self.assertEqual(User.objects.get_by_natural_key('Test@Example.com'), user)
+
+    def test_default_manager_defers_profile_fields(self):
+        """Test that profile-only fields are not loaded by default"""
+        User.objects.create_user(**self.user_data)
+        user = User.objects.get(email=self.user_data['email'])
+        self.assertEqual(
+            user.get_deferred_fields(),
+            {'bio', 'avatar', 'date_of_birth'}
+        )
+        
+        # Deferred fields still load on access
+        self.assertEqual(user.bio, 'Test bio')
+
     def test_user_password_validation(self):
         """Test user password validation"""
         user_data = self.user_data.copy()
@@ -1,10 +1,20 @@
+from unittest import mock
 from django.test import TestCase
 from django.contrib.auth import get_user_model
+from django.db.models import Prefetch
 from django.utils import timezone
 from rest_framework.test import APITestCase
 from rest_framework import serializers
-from authentication.serializers import UserRegistrationSerializer, UserProfileSerializer
+from rest_framework_simplejwt.tokens import AccessToken
+from authentication.serializers import (
+    USER_INFO_TTL,
+    CustomTokenObtainPairSerializer,
+    UserRegistrationSerializer,
+    UserProfileSerializer
+)
+from blog.models import BlogPost
 from datetime import date
+import time
 
 User = get_user_model()
 
@@ -38,6 +48,23 @@ class UserRegistrationSerializerTest(TestCase):
         self.assertFalse(serializer.is_valid())
         self.assertIn('non_field_errors', serializer.errors)
 
+    def test_weak_password(self):
+        """Test password strength validation"""
+        data = self.valid_data.copy()
+        data['password'] = data['password_confirm'] = '12345678'
+        serializer = UserRegistrationSerializer(data=data)
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('password', serializer.errors)
+
+    def test_password_mismatch_skips_strength_validation(self):
+        """Test that password strength isn't checked when confirmation fails"""
+        data = self.valid_data.copy()
+        data['password'] = '123'
+        serializer = UserRegistrationSerializer(data=data)
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('non_field_errors', serializer.errors)
+        self.assertNotIn('password', serializer.errors)
+
     def test_missing_required_fields(self):
         """Test missing required fields"""
         # Test missing username
@@ -89,6 +116,20 @@ class UserRegistrationSerializerTest(TestCase):
         self.assertFalse(serializer.is_valid())
         self.assertIn('email', serializer.errors)
 
+    def test_duplicate_email_different_case(self):
+        """Test duplicate email validation ignores case"""
+        User.objects.create_user(
+            username='existinguser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        
+        data = self.valid_data.copy()
+        data['email'] = 'Test@Example.com'
+        serializer = UserRegistrationSerializer(data=data)
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('email', serializer.errors)
+
     def test_duplicate_username(self):
         """Test duplicate username validation"""
         # Create a user first
@@ -102,6 +143,30 @@ class UserRegistrationSerializerTest(TestCase):
         self.assertFalse(serializer.is_valid())
         self.assertIn('username', serializer.errors)
 
+    def test_uniqueness_checked_in_single_query(self):
+        """Test that email and username uniqueness share one query"""
+        serializer = UserRegistrationSerializer(data=self.valid_data)
+        with self.assertNumQueries(1):
+            self.assertTrue(serializer.is_valid())
+
+    def test_duplicate_email_and_username(self):
+        """Test that both duplicate fields are reported together"""
+        User.objects.create_user(
+            username='testuser',
+            email='other@example.com',
+            password='testpass123'
+        )
+        User.objects.create_user(
+            username='otheruser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        
+        serializer = UserRegistrationSerializer(data=self.valid_data)
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('email', serializer.errors)
+        self.assertIn('username', serializer.errors)
+
     def test_optional_fields(self):
         """Test optional fields are not required"""
         data = {
@@ -216,8 +281,8 @@ class UserProfileSerializerTest(TestCase):
         
         expected_fields = {
             'id', 'username', 'email', 'first_name', 'last_name',
-            'full_name', 'bio', 'avatar', 'date_of_birth', 
-            'is_verified', 'date_joined', 'posts_count', 
+            'full_name', 'bio', 'avatar', 'avatar_width', 'avatar_height',
+            'date_of_birth', 'is_verified', 'date_joined', 'posts_count', 
             'comments_count', 'download_count'
         }
         
@@ -246,9 +311,116 @@ class UserProfileSerializerTest(TestCase):
         serializer = UserProfileSerializer(self.user)
         self.assertEqual(serializer.data['comments_count'], 0)
 
+    def test_posts_count_uses_prefetched_posts(self):
+        """Test that prefetched published posts are counted without a query"""
+        BlogPost.objects.create(
+            title='Published', content='Content', author=self.user,
+            status=BlogPost.PUBLISHED
+        )
+        BlogPost.objects.create(
+            title='Draft', content='Content', author=self.user,
+            status=BlogPost.DRAFT
+        )
+        user = User.objects.prefetch_related(Prefetch(
+            'blog_posts',
+            queryset=BlogPost.objects.filter(status=BlogPost.PUBLISHED),
+            to_attr='published_posts'
+        )).get(pk=self.user.pk)
+        
+        serializer = UserProfileSerializer(user)
+        with self.assertNumQueries(0):
+            posts_count = serializer.get_posts_count(user)
+        self.assertEqual(posts_count, 1)
+
     def test_download_count_field(self):
         """Test that download_count field is present"""
         serializer = UserProfileSerializer(self.user)
         self.assertIn('download_count', serializer.data)
         self.assertEqual(serializer.data['download_count'], 0)
 
+
+    def test_counts_use_queryset_annotations(self):
+        """Test that annotated counts are used without extra queries"""
+        self.user.posts_count = 3
+        self.user.comments_count = 7
+        
+        with self.assertNumQueries(0):
+            data = UserProfileSerializer(self.user).data
+        
+        self.assertEqual(data['posts_count'], 3)
+        self.assertEqual(data['comments_count'], 7)
+
+    def test_fields_are_built_once_per_class(self):
+        """Test that field definitions are cached but each instance gets its own copies"""
+        first = UserProfileSerializer(self.user)
+        second = UserProfileSerializer(self.user, data={'bio': 'Updated'}, partial=True)
+        
+        self.assertIn('_cached_fields', UserProfileSerializer.__dict__)
+        self.assertEqual(list(first.fields), list(second.fields))
+        self.assertIsNot(first.fields['bio'], second.fields['bio'])
+        self.assertIs(first.fields['bio'].parent, first)
+        self.assertIs(second.fields['bio'].parent, second)
+        self.assertTrue(second.is_valid())
+
+
+class CustomTokenObtainPairSerializerTest(TestCase):
+    """Test cases for CustomTokenObtainPairSerializer"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123',
+            first_name='Test',
+            last_name='User'
+        )
+
+    def test_response_includes_user_info(self):
+        """Test that the login response includes user info"""
+        serializer = CustomTokenObtainPairSerializer(data={
+            'email': 'test@example.com',
+            'password': 'testpass123'
+        })
+        self.assertTrue(serializer.is_valid())
+        
+        self.assertEqual(serializer.validated_data['user'], {
+            'id': self.user.id,
+            'username': 'testuser',
+            'email': 'test@example.com',
+            'full_name': 'Test User',
+            'is_verified': False,
+        })
+
+    def test_tokens_include_custom_claims(self):
+        """Test that access tokens carry the custom user claims"""
+        serializer = CustomTokenObtainPairSerializer(data={
+            'email': 'test@example.com',
+            'password': 'testpass123'
+        })
+        self.assertTrue(serializer.is_valid())
+        
+        access = AccessToken(serializer.validated_data['access'])
+        self.assertEqual(access['username'], 'testuser')
+        self.assertEqual(access['email'], 'test@example.com')
+        self.assertEqual(access['full_name'], 'Test User')
+        self.assertFalse(access['is_verified'])
+
+    def test_user_info_memoized_until_user_changes(self):
+        """Test that user info is reused until a user attribute changes"""
+        # Within one USER_INFO_TTL window
+        with mock.patch('authentication.serializers.time.monotonic', return_value=time.monotonic()):
+            info = CustomTokenObtainPairSerializer.get_user_info(self.user)
+            self.assertIs(CustomTokenObtainPairSerializer.get_user_info(self.user), info)
+            
+            self.user.first_name = 'Changed'
+            changed_info = CustomTokenObtainPairSerializer.get_user_info(self.user)
+        self.assertEqual(changed_info['full_name'], 'Changed User')
+
+    def test_user_info_memoized_for_ttl(self):
+        """Test that memoized user info is rebuilt once USER_INFO_TTL passes"""
+        now = time.monotonic()
+        with mock.patch('authentication.serializers.time.monotonic', return_value=now):
+            info = CustomTokenObtainPairSerializer.get_user_info(self.user)
+        with mock.patch('authentication.serializers.time.monotonic', return_value=now + USER_INFO_TTL):
+            self.assertIsNot(CustomTokenObtainPairSerializer.get_user_info(self.user), info)
@@ -1,23 +1,28 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest import mock
+from django.test import TestCase, override_settings
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
 from rest_framework_simplejwt.tokens import RefreshToken
 from authentication.serializers import UserRegistrationSerializer, UserProfileSerializer
 from authentication.views import RegisterView, ProfileView, LogoutView, CustomTokenObtainPairView
+from authentication.authentication import validated_token
 
 User = get_user_model()
 
 
+@override_settings(NPLUSONE_RAISE=True)
 class AuthenticationViewsTest(APITestCase):
     """Test cases for authentication views"""
 
-    def setUp(self):
-        """Set up test data"""
-        self.client = APIClient()
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data once for the whole class"""
+        cls.user = User.objects.create_user(
             username='testuser',
             email='test@example.com',
             password='testpass123',
@@ -26,13 +31,21 @@ class AuthenticationViewsTest(APITestCase):
         )
         
         # Create another user for testing
-        self.other_user = User.objects.create_user(
+        cls.other_user = User.objects.create_user(
             username='otheruser',
             email='other@example.com',
             password='testpass123'
         )
+        
+        # Sign the user's tokens once; every test reuses them
+        cls.tokens = cls.get_tokens_for_user(cls.user)
+
+    def setUp(self):
+        """Set up a fresh client for each test"""
+        self.client = APIClient()
 
-    def get_tokens_for_user(self, user):
+    @staticmethod
+    def get_tokens_for_user(user):
         """Helper method to get JWT tokens for a user"""
         refresh = RefreshToken.for_user(user)
         return {
@@ -52,7 +65,9 @@ class AuthenticationViewsTest(APITestCase):
             'last_name': 'User'
         }
         
-        response = self.client.post(url, data, format='json')
+        # Uniqueness check, insert, and the outstanding refresh token row
+        with self.assertNumQueries(3):
+            response = self.client.post(url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         
         # Check that user was created
@@ -61,6 +76,13 @@ class AuthenticationViewsTest(APITestCase):
         self.assertEqual(user.email, 'newuser@example.com')
         self.assertEqual(user.first_name, 'New')
         self.assertEqual(user.last_name, 'User')
+        
+        # The user is returned in the profile shape
+        self.assertEqual(response.data['user']['id'], user.id)
+        self.assertEqual(response.data['user']['full_name'], 'New User')
+        self.assertEqual(response.data['user']['posts_count'], 0)
+        self.assertEqual(response.data['user']['comments_count'], 0)
+        self.assertNotIn('password', response.data['user'])
 
     def test_register_view_invalid_data(self):
         """Test registration with invalid data"""
@@ -148,7 +170,7 @@ class AuthenticationViewsTest(APITestCase):
 
     def test_profile_view_get_authenticated(self):
         """Test getting profile when authenticated"""
-        tokens = self.get_tokens_for_user(self.user)
+        tokens = self.tokens
         self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {tokens["access"]}')
         
         url = reverse('authentication:profile')
@@ -161,6 +183,48 @@ class AuthenticationViewsTest(APITestCase):
         self.assertEqual(response.data['first_name'], 'Test')
         self.assertEqual(response.data['last_name'], 'User')
 
+    def test_profile_view_get_query_count(self):
+        """Test that profile fields and counts are loaded in one query"""
+        tokens = self.tokens
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {tokens["access"]}')
+        
+        url = reverse('authentication:profile')
+        # Authenticating the token user loads the annotated profile
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_profile_view_inactive_user(self):
+        """Test that an inactive user's token is rejected"""
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.tokens["access"]}')
+        
+        response = self.client.get(reverse('authentication:profile'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_access_token_validated_once(self):
+        """Test that a repeated access token is decoded once, not per request"""
+        validated_token.cache_clear()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.tokens["access"]}')
+        
+        for _ in range(2):
+            response = self.client.get(reverse('authentication:profile'))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(validated_token.cache_info().misses, 1)
+        self.assertEqual(validated_token.cache_info().hits, 1)
+
+    def test_expired_access_token_rejected_when_cached(self):
+        """Test that a cached access token stops working once it expires"""
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.tokens["access"]}')
+        url = reverse('authentication:profile')
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        
+        later = timezone.now() + timedelta(days=1)
+        with mock.patch('authentication.authentication.aware_utcnow', return_value=later), \
+                mock.patch('rest_framework_simplejwt.tokens.aware_utcnow', return_value=later):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
     def test_profile_view_get_unauthenticated(self):
         """Test getting profile when not authenticated"""
         url = reverse('authentication:profile')
@@ -169,7 +233,7 @@ class AuthenticationViewsTest(APITestCase):
 
     def test_profile_view_patch_authenticated(self):
         """Test updating profile when authenticated"""
-        tokens = self.get_tokens_for_user(self.user)
+        tokens = self.tokens
         self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {tokens["access"]}')
         
         url = reverse('authentication:profile')
@@ -198,7 +262,7 @@ class AuthenticationViewsTest(APITestCase):
 
     def test_profile_view_read_only_fields(self):
         """Test that read-only fields cannot be updated"""
-        tokens = self.get_tokens_for_user(self.user)
+        tokens = self.tokens
         self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {tokens["access"]}')
         
         url = reverse('authentication:profile')
@@ -219,7 +283,7 @@ class AuthenticationViewsTest(APITestCase):
 
     def test_profile_view_methods(self):
         """Test profile view supports correct HTTP methods"""
-        tokens = self.get_tokens_for_user(self.user)
+        tokens = self.tokens
         self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {tokens["access"]}')
         
         url = reverse('authentication:profile')
@@ -242,7 +306,7 @@ class AuthenticationViewsTest(APITestCase):
 
     def test_logout_view_success(self):
         """Test successful logout"""
-        tokens = self.get_tokens_for_user(self.user)
+        tokens = self.tokens
         self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {tokens["access"]}')
         
         url = reverse('authentication:logout')
@@ -251,9 +315,25 @@ class AuthenticationViewsTest(APITestCase):
         response = self.client.post(url, data, format='json')
         self.assertIn(response.status_code, [status.HTTP_205_RESET_CONTENT, status.HTTP_200_OK, status.HTTP_400_BAD_REQUEST])
 
+    def test_logout_view_blacklists_refresh_token(self):
+        """Test that logout blacklists the refresh token"""
+        tokens = self.tokens
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {tokens["access"]}')
+        url = reverse('authentication:logout')
+        
+        response = self.client.post(url, {'refresh_token': tokens['refresh']}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_205_RESET_CONTENT)
+        
+        jti = RefreshToken(tokens['refresh'], verify=False)['jti']
+        self.assertTrue(BlacklistedToken.objects.filter(token__jti=jti).exists())
+        
+        # A blacklisted token can't be used to log out again
+        response = self.client.post(url, {'refresh_token': tokens['refresh']}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_logout_view_invalid_token(self):
         """Test logout with invalid token"""
-        tokens = self.get_tokens_for_user(self.user)
+        tokens = self.tokens
         self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {tokens["access"]}')
         url = reverse('authentication:logout')
         data = {'refresh_token': 'invalid_token'}
@@ -262,7 +342,7 @@ class AuthenticationViewsTest(APITestCase):
 
     def test_logout_view_missing_token(self):
         """Test logout without token"""
-        tokens = self.get_tokens_for_user(self.user)
+        tokens = self.tokens
         self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {tokens["access"]}')
         url = reverse('authentication:logout')
         data = {}
@@ -283,7 +363,9 @@ class AuthenticationViewsTest(APITestCase):
             'email': 'test@example.com',
             'password': 'testpass123'
         }
-        response = self.client.post(url, data, format='json')
+        # User lookup, outstanding refresh token row, last_login update
+        with self.assertNumQueries(3):
+            response = self.client.post(url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         # Check that tokens are returned
         self.assertIn('access', response.data)
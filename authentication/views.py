@@ -4,8 +4,11 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.views import TokenObtainPairView
+from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import logout
+from django.db import transaction
+from .authentication import ProfileJWTAuthentication
 from .models import CustomUser
 from .serializers import (
     CustomTokenObtainPairSerializer,
@@ -36,7 +39,7 @@ class RegisterView(generics.CreateAPIView):
         refresh = RefreshToken.for_user(user)
         
         return Response({
-            'user': UserProfileSerializer(user).data,
+            'user': serializer.data,
             'tokens': {
                 'refresh': str(refresh),
                 'access': str(refresh.access_token),
@@ -49,9 +52,19 @@ class ProfileView(generics.RetrieveUpdateAPIView):
     User profile management
     """
     serializer_class = UserProfileSerializer
+    authentication_classes = [ProfileJWTAuthentication]
     permission_classes = [permissions.IsAuthenticated]
     
+    def get_queryset(self):
+        """
+        Annotate post/comment counts so the serializer doesn't query per user.
+        Any view serializing users with UserProfileSerializer should apply
+        the same annotations, otherwise the serializer falls back to COUNT queries.
+        """
+        return CustomUser.objects.with_profile_counts()
+    
     def get_object(self):
+        # ProfileJWTAuthentication already loaded the user from get_queryset()
         return self.request.user
 
 class LogoutView(APIView):
@@ -62,13 +75,15 @@ class LogoutView(APIView):
     
     def post(self, request):
         try:
-            refresh_token = request.data["refresh_token"]
-            token = RefreshToken(refresh_token)
-            token.blacklist()
-            return Response({
-                'message': 'Successfully logged out'
-            }, status=status.HTTP_205_RESET_CONTENT)
-        except Exception as e:
+            token = RefreshToken(request.data["refresh_token"])
+            # The outstanding and blacklisted rows commit together
+            with transaction.atomic():
+                token.blacklist()
+        except (KeyError, TypeError, TokenError):
             return Response({
                 'error': 'Invalid token'
-            }, status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({
+            'message': 'Successfully logged out'
+        }, status=status.HTTP_205_RESET_CONTENT)
\ No newline at end of file
@@ -1,7 +1,8 @@
 # ===== blog/admin.py =====
 from django.contrib import admin
+from django.db.models import Count
 from django.utils.html import format_html
-from .models import Category, Tag, BlogPost
+from .models import Category, Tag, BlogPost, Like
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
@@ -10,9 +11,13 @@ class CategoryAdmin(admin.ModelAdmin):
     search_fields = ['name', 'description']
     readonly_fields = ['created_at', 'updated_at']
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(_post_count=Count('posts'))
+    
     def post_count(self, obj):
-        return obj.posts.count()
+        return obj._post_count
     post_count.short_description = 'Posts'
+    post_count.admin_order_field = '_post_count'
 
 @admin.register(Tag)
 class TagAdmin(admin.ModelAdmin):
@@ -21,9 +26,13 @@ class TagAdmin(admin.ModelAdmin):
     search_fields = ['name']
     readonly_fields = ['created_at']
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(_post_count=Count('posts'))
+    
     def post_count(self, obj):
-        return obj.posts.count()
+        return obj._post_count
     post_count.short_description = 'Posts'
+    post_count.admin_order_field = '_post_count'
 
 @admin.register(BlogPost)
 class BlogPostAdmin(admin.ModelAdmin):
@@ -55,4 +64,14 @@ class BlogPostAdmin(admin.ModelAdmin):
     ]
     
     def get_queryset(self, request):
-        return super().get_queryset(request).select_related('author', 'category')
\ No newline at end of file
+        return super().get_queryset(request).select_related(
+            'author', 'category'
+        ).prefetch_related('tags')
+
+@admin.register(Like)
+class LikeAdmin(admin.ModelAdmin):
+    list_display = ['user', 'post', 'created_at']
+    list_select_related = ['user', 'post']
+    search_fields = ['user__username', 'post__title']
+    raw_id_fields = ['user', 'post']
+    readonly_fields = ['created_at']
@@ -0,0 +1,70 @@
+# ===== blog/cache.py =====
+import hashlib
+import threading
+from django.core.cache import cache, caches
+from django.core.cache.backends.redis import RedisCache
+from django.utils import timezone
+
+# Rendered post lists are cached per version; blog.signals drops the version
+# whenever a post, comment, category or tag changes. View and like counts
+# are updated without signals, so a version also expires after a minute.
+POST_LIST_TIMEOUT = 60
+POST_LIST_VERSION_KEY = 'posts:list_version'
+POST_LIST_KEY_FORMAT = 'posts:list:%s:%s:%s'
+# The popular posts are the same for every user
+POPULAR_POSTS_KEY_FORMAT = 'posts:popular:%s:%s'
+
+def post_list_version():
+    """
+    Return when the current post list version started
+    """
+    version = cache.get(POST_LIST_VERSION_KEY)
+    if version is None:
+        version = timezone.now()
+        if not cache.add(POST_LIST_VERSION_KEY, version, POST_LIST_TIMEOUT):
+            version = cache.get(POST_LIST_VERSION_KEY, version)
+    return version
+
+def post_list_key(request, *args, **kwargs):
+    """Cache key for one user's view of a list URL"""
+    return POST_LIST_KEY_FORMAT % (
+        post_list_version().timestamp(), request.user.pk, request.get_full_path()
+    )
+
+def post_list_etag(request, *args, **kwargs):
+    """ETag for one user's view of a list URL; hashed so it doesn't expose the key"""
+    return hashlib.sha256(post_list_key(request).encode()).hexdigest()
+
+# Ids of posts with views buffered by BlogPost.record_view(), kept as a set in
+# the 'post_views' cache so flushing only visits those posts
+PENDING_VIEWS_KEY = 'post_views_pending'
+
+# Serializes updates to the set in caches without native sets; those are
+# local to the process, so a process-wide lock makes them atomic
+_local_lock = threading.Lock()
+
+def mark_views_pending(post_id):
+    """Note that a post has buffered views to flush"""
+    views = caches['post_views']
+    if isinstance(views, RedisCache):
+        key = views.make_and_validate_key(PENDING_VIEWS_KEY)
+        views._cache.get_client(key, write=True).sadd(key, post_id)
+        return
+    
+    with _local_lock:
+        pending = views.get(PENDING_VIEWS_KEY, set())
+        pending.add(post_id)
+        views.set(PENDING_VIEWS_KEY, pending, None)
+
+def pop_posts_with_pending_views(count):
+    """Remove and return up to `count` ids noted by mark_views_pending()"""
+    views = caches['post_views']
+    if isinstance(views, RedisCache):
+        key = views.make_and_validate_key(PENDING_VIEWS_KEY)
+        return [int(pk) for pk in views._cache.get_client(key, write=True).spop(key, count)]
+    
+    with _local_lock:
+        pending = views.get(PENDING_VIEWS_KEY, set())
+        popped = [pending.pop() for _ in range(min(count, len(pending)))]
+        views.set(PENDING_VIEWS_KEY, pending, None)
+    return popped
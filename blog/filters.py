@@ -1,16 +1,71 @@
 # ===== blog/filters.py =====
 import django_filters
+from datetime import datetime, time
 from django_filters import rest_framework as filters
-from django.db.models import Q
+from django_filters.fields import ModelChoiceField, ModelMultipleChoiceField
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
 from .models import BlogPost, Category, Tag
 
+# Categories and tags change rarely, so the ids accepted by the filters are
+# cached; blog.signals drops the entry whenever one is saved or deleted
+FILTER_CHOICES_TIMEOUT = 60
+FILTER_CHOICES_KEY_FORMAT = 'filter:%s_ids'
+
+def cached_pks(model):
+    """
+    Return the set of primary keys for a filter's reference model
+    """
+    key = FILTER_CHOICES_KEY_FORMAT % model._meta.model_name
+    pks = cache.get(key)
+    if pks is None:
+        pks = frozenset(model.objects.values_list('pk', flat=True))
+        cache.set(key, pks, FILTER_CHOICES_TIMEOUT)
+    return pks
+
+class CachedPKMixin:
+    """
+    Check submitted ids against the cached primary keys instead of fetching
+    the instances; the filters only need the ids
+    """
+    def _to_cached_pk(self, value):
+        try:
+            pk = int(value)
+        except (TypeError, ValueError):
+            pk = None
+        if pk not in cached_pks(self.queryset.model):
+            raise ValidationError(
+                self.error_messages['invalid_choice'],
+                code='invalid_choice',
+                params={'value': value}
+            )
+        return pk
+
+class CachedModelChoiceField(CachedPKMixin, ModelChoiceField):
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        return self._to_cached_pk(value)
+
+class CachedModelMultipleChoiceField(CachedPKMixin, ModelMultipleChoiceField):
+    def _check_values(self, value):
+        return [self._to_cached_pk(v) for v in dict.fromkeys(value)]
+
+class CachedModelChoiceFilter(filters.ModelChoiceFilter):
+    field_class = CachedModelChoiceField
+
+class CachedModelMultipleChoiceFilter(filters.ModelMultipleChoiceFilter):
+    field_class = CachedModelMultipleChoiceField
+
 class BlogPostFilter(filters.FilterSet):
     """
     Advanced filtering for blog posts
     """
     # Date filtering
-    date_from = filters.DateFilter(field_name='publication_date', lookup_expr='gte')
-    date_to = filters.DateFilter(field_name='publication_date', lookup_expr='lte')
+    date_from = filters.DateFilter(method='filter_publication_date')
+    date_to = filters.DateFilter(method='filter_publication_date')
     created_after = filters.DateTimeFilter(field_name='created_at', lookup_expr='gte')
     created_before = filters.DateTimeFilter(field_name='created_at', lookup_expr='lte')
     
@@ -18,14 +73,15 @@ class BlogPostFilter(filters.FilterSet):
     search = filters.CharFilter(method='filter_search')
     
     # Category and tags
-    category = filters.ModelChoiceFilter(queryset=Category.objects.all())
+    category = CachedModelChoiceFilter(queryset=Category.objects.all())
     category_name = filters.CharFilter(field_name='category__name', lookup_expr='icontains')
-    tags = filters.ModelMultipleChoiceFilter(queryset=Tag.objects.all())
+    tags = CachedModelMultipleChoiceFilter(queryset=Tag.objects.all())
     tag_names = filters.CharFilter(method='filter_by_tag_names')
     
     # Author filtering
     author = filters.CharFilter(field_name='author__username', lookup_expr='icontains')
     author_id = filters.NumberFilter(field_name='author__id')
+    mine = filters.BooleanFilter(method='filter_mine')
     
     # Status and visibility
     status = filters.ChoiceFilter(choices=BlogPost.STATUS_CHOICES)
@@ -40,13 +96,43 @@ class BlogPostFilter(filters.FilterSet):
         fields = [
             'date_from', 'date_to', 'created_after', 'created_before',
             'search', 'category', 'category_name', 'tags', 'tag_names',
-            'author', 'author_id', 'status', 'is_public',
+            'author', 'author_id', 'mine', 'status', 'is_public',
             'min_views', 'max_views'
         ]
     
+    def filter_publication_date(self, queryset, name, value):
+        """
+        Filter by whole days in the current timezone; when both date_from and
+        date_to are given they're applied together as one range lookup
+        """
+        date_from = self.form.cleaned_data.get('date_from')
+        date_to = self.form.cleaned_data.get('date_to')
+        
+        if name == 'date_to' and date_from:
+            # Already applied with date_from
+            return queryset
+        
+        start = date_from and timezone.make_aware(datetime.combine(date_from, time.min))
+        end = date_to and timezone.make_aware(datetime.combine(date_to, time.max))
+        
+        if start and end:
+            return queryset.filter(publication_date__range=(start, end))
+        if start:
+            return queryset.filter(publication_date__gte=start)
+        return queryset.filter(publication_date__lte=end)
+    
+    def filter_mine(self, queryset, name, value):
+        """
+        Only (or, when false, all but) the requesting user's own posts
+        """
+        user = self.request.user
+        return queryset.filter(author=user) if value else queryset.exclude(author=user)
+    
     def filter_search(self, queryset, name, value):
         """
-        Search across title, content, and excerpt
+        Search across title, content, and excerpt.
+        On PostgreSQL these icontains lookups are backed by pg_trgm GIN indexes
+        (see migration 0002_blogpost_search_trigram_indexes).
         """
         return queryset.filter(
             Q(title__icontains=value) |
@@ -59,4 +145,10 @@ class BlogPostFilter(filters.FilterSet):
         Filter by tag names (comma-separated)
         """
         tag_names = [tag.strip() for tag in value.split(',')]
-        return queryset.filter(tags__name__in=tag_names).distinct()
\ No newline at end of file
+        
+        # EXISTS avoids the duplicate rows (and DISTINCT) a join on tags gives
+        post_tags = BlogPost.tags.through.objects.filter(
+            blogpost_id=OuterRef('pk'),
+            tag__name__in=tag_names
+        )
+        return queryset.filter(Exists(post_tags))
\ No newline at end of file
@@ -19,6 +19,13 @@ class Command(BaseCommand):
             help='Delete logs older than this many days (default: 90)'
         )
         
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=10000,
+            help='Delete at most this many logs per query (default: 10000)'
+        )
+        
         parser.add_argument(
             '--dry-run',
             action='store_true',
@@ -28,18 +35,27 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         days = options['days']
         dry_run = options['dry_run']
+        batch_size = options['batch_size']
         
         cutoff_date = timezone.now() - timezone.timedelta(days=days)
         
         old_logs = DownloadLog.objects.filter(requested_at__lt=cutoff_date)
-        count = old_logs.count()
         
         if dry_run:
+            count = old_logs.count()
             self.stdout.write(
                 self.style.WARNING(f'DRY RUN: Would delete {count} download logs older than {days} days')
             )
         else:
-            deleted_count, _ = old_logs.delete()
+            # Delete in batches to keep each DELETE (and its transaction) bounded
+            deleted_count = 0
+            while True:
+                batch = list(old_logs.order_by().values_list('pk', flat=True)[:batch_size])
+                if not batch:
+                    break
+                deleted, _ = DownloadLog.objects.filter(pk__in=batch).delete()
+                deleted_count += deleted
+            
             self.stdout.write(
                 self.style.SUCCESS(f'Successfully deleted {deleted_count} download logs older than {days} days')
             )
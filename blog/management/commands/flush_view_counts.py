@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from blog.models import BlogPost
+
+class Command(BaseCommand):
+    """
+    Management command to write buffered post views to the database
+    """
+    help = 'Write post views buffered by VIEW_COUNT_BATCH_SIZE to view_count'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Check this many posts per cache lookup (default: 500)'
+        )
+    
+    def handle(self, *args, **options):
+        flushed = BlogPost.flush_buffered_views(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Wrote {flushed} buffered post views'))
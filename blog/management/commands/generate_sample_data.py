@@ -1,6 +1,13 @@
 # ===== blog/management/commands/generate_sample_data.py =====
 from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.text import slugify
+from blog.cache import POST_LIST_VERSION_KEY
+from blog.filters import FILTER_CHOICES_KEY_FORMAT
 from blog.models import Category, Tag, BlogPost
 from faker import Faker
 import random
@@ -19,72 +26,129 @@ class Command(BaseCommand):
         parser.add_argument('--posts', type=int, default=50, help='Number of posts to create')
         parser.add_argument('--categories', type=int, default=10, help='Number of categories to create')
         parser.add_argument('--tags', type=int, default=20, help='Number of tags to create')
+        parser.add_argument('--seed', type=int, help='Seed for reproducible sample data')
     
+    @transaction.atomic
     def handle(self, *args, **options):
         self.stdout.write('Creating sample data...')
         
+        # Everything commits once at the end; on PostgreSQL that single commit
+        # needn't wait for the WAL flush, as sample data is cheap to regenerate
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL synchronous_commit = OFF')
+        
+        if options['seed'] is not None:
+            Faker.seed(options['seed'])
+            random.seed(options['seed'])
+        
+        # fake.unique keeps generated values distinct within this run; the
+        # sets below only need to skip values already in the database
+        fake.unique.clear()
+        
+        # bulk_create skips Model.save(), so values it would normally fill in
+        # (hashed password, lowercase email, slugs, publication date, word
+        # count, popularity) are set here
+        
         # Create users
-        users = []
-        for i in range(options['users']):
-            username = fake.user_name()
-            while User.objects.filter(username=username).exists():
-                username = fake.user_name()
-            
-            user = User.objects.create_user(
-                username=username,
-                email=fake.email(),
+        usernames = set(User.objects.values_list('username', flat=True))
+        emails = set(User.objects.values_list('email', flat=True))
+        password = make_password('testpass123')
+        
+        users = User.objects.bulk_create([
+            User(
+                username=self._unique(fake.unique.user_name, usernames),
+                email=self._unique(lambda: fake.unique.email().lower(), emails),
                 first_name=fake.first_name(),
                 last_name=fake.last_name(),
                 bio=fake.text(max_nb_chars=200),
-                password='testpass123'
+                password=password
             )
-            users.append(user)
+            for i in range(options['users'])
+        ], batch_size=500)
         
         self.stdout.write(f'Created {len(users)} users')
         
         # Create categories
+        category_names = set(Category.objects.values_list('name', flat=True))
         categories = []
         for i in range(options['categories']):
-            category = Category.objects.create(
-                name=fake.word().title(),
+            name = self._unique(lambda: fake.unique.word().title(), category_names)
+            categories.append(Category(
+                name=name,
+                slug=slugify(name),
                 description=fake.sentence()
-            )
-            categories.append(category)
+            ))
+        categories = Category.objects.bulk_create(categories, batch_size=500)
         
         self.stdout.write(f'Created {len(categories)} categories')
         
         # Create tags
+        tag_names = set(Tag.objects.values_list('name', flat=True))
         tags = []
         for i in range(options['tags']):
-            tag_name = fake.word()
-            while Tag.objects.filter(name=tag_name).exists():
-                tag_name = fake.word()
-            
-            tag = Tag.objects.create(name=tag_name)
-            tags.append(tag)
+            name = self._unique(fake.unique.word, tag_names)
+            tags.append(Tag(name=name, slug=slugify(name)))
+        tags = Tag.objects.bulk_create(tags, batch_size=500)
         
         self.stdout.write(f'Created {len(tags)} tags')
         
         # Create posts
+        slugs = set(BlogPost.objects.values_list('slug', flat=True))
+        now = timezone.now()
         posts = []
         for i in range(options['posts']):
-            post = BlogPost.objects.create(
-                title=fake.sentence(nb_words=6)[:-1],  # Remove period
-                content=fake.text(max_nb_chars=2000),
+            title = self._unique(
+                lambda: fake.unique.sentence(nb_words=6)[:-1],  # Remove period
+                slugs,
+                key=slugify
+            )
+            status = random.choice(['published', 'published', 'draft'])  # 66% published
+            content = fake.text(max_nb_chars=2000)
+            view_count = random.randint(0, 1000)
+            like_count = random.randint(0, 100)
+            posts.append(BlogPost(
+                title=title,
+                slug=slugify(title),
+                content=content,
+                word_count=len(content.split()),
                 excerpt=fake.text(max_nb_chars=200),
                 author=random.choice(users),
                 category=random.choice(categories),
                 is_public=random.choice([True, True, True, False]),  # 75% public
-                status=random.choice(['published', 'published', 'draft']),  # 66% published
-                view_count=random.randint(0, 1000),
-                like_count=random.randint(0, 100)
-            )
-            
-            # Add random tags
-            post_tags = random.sample(tags, random.randint(1, 5))
-            post.tags.set(post_tags)
-            
-            posts.append(post)
+                status=status,
+                publication_date=now if status == BlogPost.PUBLISHED else None,
+                view_count=view_count,
+                like_count=like_count,
+                popularity=view_count + like_count
+            ))
+        posts = BlogPost.objects.bulk_create(posts, batch_size=200)
+        
+        # Add random tags; the posts are new, so insert links directly rather
+        # than going through tags.set() per post
+        PostTag = BlogPost.tags.through
+        PostTag.objects.bulk_create([
+            PostTag(blogpost_id=post.id, tag_id=tag.id)
+            for post in posts
+            for tag in random.sample(tags, random.randint(1, 5))
+        ], batch_size=1000, ignore_conflicts=True)
         
         self.stdout.write(f'Created {len(posts)} blog posts')
-        self.stdout.write(self.style.SUCCESS('Sample data created successfully!'))
\ No newline at end of file
+        
+        # bulk_create sends no post_save, so clear the cached filter ids and
+        # post lists here
+        transaction.on_commit(lambda: cache.delete_many([
+            FILTER_CHOICES_KEY_FORMAT % model._meta.model_name for model in (Category, Tag)
+        ] + [POST_LIST_VERSION_KEY]))
+        self.stdout.write(self.style.SUCCESS('Sample data created successfully!'))
+    
+    def _unique(self, generate, taken, key=None):
+        """
+        Generate a value whose key isn't in `taken`, and reserve it
+        """
+        key = key or (lambda value: value)
+        value = generate()
+        while key(value) in taken:
+            value = generate()
+        taken.add(key(value))
+        return value
@@ -0,0 +1,40 @@
+from django.db import migrations
+
+# Columns covered by BlogPostFilter.filter_search
+SEARCH_COLUMNS = ['title', 'content', 'excerpt']
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """
+    Index UPPER(column::text) with pg_trgm so the icontains lookups used by
+    the post search (UPPER(col::text) LIKE UPPER(...)) can use an index
+    instead of a sequential scan. Other databases keep scanning.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for column in SEARCH_COLUMNS:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS blog_blogpost_{column}_trgm '
+            f'ON blog_blogpost USING gin ((UPPER("{column}"::text)) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    for column in SEARCH_COLUMNS:
+        schema_editor.execute(f'DROP INDEX IF EXISTS blog_blogpost_{column}_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
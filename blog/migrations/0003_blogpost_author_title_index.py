@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-15 23:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0002_blogpost_search_trigram_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(fields=['author', 'title'], name='blog_blogpo_author__aa9563_idx'),
+        ),
+    ]
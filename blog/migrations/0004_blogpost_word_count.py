@@ -0,0 +1,33 @@
+# Generated by Django 5.2.5 on 2026-10-15 23:16
+
+from django.db import migrations, models
+
+
+def count_words(apps, schema_editor):
+    BlogPost = apps.get_model('blog', 'BlogPost')
+    posts = BlogPost.objects.only('pk', 'content')
+    # Batched so existing posts are updated a few hundred rows per query
+    batch = []
+    for post in posts.iterator(chunk_size=500):
+        post.word_count = len(post.content.split())
+        batch.append(post)
+        if len(batch) == 500:
+            BlogPost.objects.bulk_update(batch, ['word_count'])
+            batch = []
+    BlogPost.objects.bulk_update(batch, ['word_count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0003_blogpost_author_title_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_words, migrations.RunPython.noop),
+    ]
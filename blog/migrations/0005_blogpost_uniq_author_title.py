@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-15 23:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_blogpost_word_count'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='blogpost',
+            constraint=models.UniqueConstraint(fields=('author', 'title'), name='uniq_author_title'),
+        ),
+        migrations.RemoveIndex(
+            model_name='blogpost',
+            name='blog_blogpo_author__aa9563_idx',
+        ),
+    ]
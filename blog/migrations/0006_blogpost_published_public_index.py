@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-15 23:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0005_blogpost_uniq_author_title'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(condition=models.Q(('is_public', True), ('status', 'published')), fields=['-created_at'], name='idx_published_public'),
+        ),
+        migrations.RemoveIndex(
+            model_name='blogpost',
+            name='blog_blogpo_status_6124b7_idx',
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.5 on 2026-10-15 23:51
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def compute_popularity(apps, schema_editor):
+    BlogPost = apps.get_model('blog', 'BlogPost')
+    BlogPost.objects.update(popularity=F('view_count') + F('like_count'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0007_like'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='popularity',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(compute_popularity, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(condition=models.Q(('is_public', True), ('status', 'published')), fields=['-popularity', '-created_at'], name='idx_popular_published_public'),
+        ),
+    ]
@@ -1,9 +1,12 @@
 # ===== blog/models.py =====
 from django.db import models
+from django.db.models import F, Q
 from django.conf import settings
+from django.core.cache import caches
 from django.utils import timezone
 from django.urls import reverse
 from django.utils.text import slugify
+from .cache import mark_views_pending, pop_posts_with_pending_views
 
 class Category(models.Model):
     """
@@ -46,6 +49,30 @@ class Tag(models.Model):
             self.slug = slugify(self.name)
         super().save(*args, **kwargs)
 
+# Views counted but not yet written to BlogPost.view_count, in the
+# 'post_views' cache
+VIEW_COUNT_KEY_FORMAT = 'post_views:%s'
+
+class BlogPostQuerySet(models.QuerySet):
+    def viewable_by(self, user):
+        """
+        Posts the user may view, filtered in the database; mirrors
+        BlogPost.can_be_viewed_by
+        """
+        if not user.is_authenticated:
+            return self.none()
+        return self.filter(
+            Q(author=user) |
+            Q(is_public=True, status=BlogPost.PUBLISHED)
+        )
+    
+    def add_views(self, count):
+        """Add views to view_count, and popularity with it, in one UPDATE"""
+        return self.update(
+            view_count=F('view_count') + count,
+            popularity=F('popularity') + count
+        )
+
 class BlogPost(models.Model):
     """
     Main blog post model with all required features
@@ -60,6 +87,8 @@ class BlogPost(models.Model):
         (ARCHIVED, 'Archived'),
     ]
     
+    objects = BlogPostQuerySet.as_manager()
+    
     title = models.CharField(max_length=200)
     slug = models.SlugField(max_length=200, unique=True, blank=True)
     content = models.TextField()
@@ -98,30 +127,91 @@ class BlogPost(models.Model):
     # Engagement metrics
     view_count = models.PositiveIntegerField(default=0)
     like_count = models.PositiveIntegerField(default=0)
+    # view_count + like_count, stored so popular posts are read off an index
+    # instead of summing and sorting every public post
+    popularity = models.PositiveIntegerField(default=0, editable=False)
+    
+    # Derived from content on save, so reading time isn't recomputed per request
+    word_count = models.PositiveIntegerField(default=0, editable=False)
     
     class Meta:
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['status', 'is_public']),
+            # Public listings filter on published/public and order by newest;
+            # a partial index leaves drafts and private posts out of it
+            models.Index(
+                fields=['-created_at'],
+                condition=Q(status='published', is_public=True),
+                name='idx_published_public'
+            ),
             models.Index(fields=['publication_date']),
+            # Popular posts: public published posts by popularity, then newest
+            models.Index(
+                fields=['-popularity', '-created_at'],
+                condition=Q(status='published', is_public=True),
+                name='idx_popular_published_public'
+            ),
+            # The other half of the list view's OR: an author's own posts,
+            # newest first (the index is read backwards for -created_at)
             models.Index(fields=['author', 'created_at']),
         ]
+        constraints = [
+            # Authors can't reuse a title; its index also serves author/title lookups
+            models.UniqueConstraint(fields=['author', 'title'], name='uniq_author_title'),
+        ]
+    
+    # Body as loaded from the database, for save()'s change check
+    _loaded_content = None
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_content = instance.__dict__.get('content')
+        return instance
     
     def __str__(self):
         return self.title
     
     def save(self, *args, **kwargs):
+        # Targeted saves (e.g. update_fields=['view_count']) only refresh the
+        # derived fields of the columns they write
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            update_fields = set(update_fields)
+        derived = set()
+        
         # Auto-generate slug from title
-        if not self.slug:
+        if (update_fields is None or 'title' in update_fields) and not self.slug:
             self.slug = slugify(self.title)
+            derived.add('slug')
         
         # Set publication date when status changes to published
-        if self.status == self.PUBLISHED and not self.publication_date:
+        if (update_fields is None or 'status' in update_fields) and \
+                self.status == self.PUBLISHED and not self.publication_date:
             self.publication_date = timezone.now()
+            derived.add('publication_date')
+        
+        if update_fields is None or 'content' in update_fields:
+            # Deferred content is left unloaded; it can't have changed
+            content = self.__dict__.get('content')
+            
+            # Generate excerpt from content if not provided
+            if not self.excerpt and content:
+                self.excerpt = content[:297] + "..."
+                derived.add('excerpt')
+            
+            # Only re-count words when the body changed since it was loaded
+            if content is not None and content != self._loaded_content:
+                self.word_count = len(content.split())
+                self._loaded_content = content
+                derived.add('word_count')
         
-        # Generate excerpt from content if not provided
-        if not self.excerpt and self.content:
-            self.excerpt = self.content[:297] + "..."
+        if update_fields is None or update_fields & {'view_count', 'like_count'}:
+            self.popularity = self.view_count + self.like_count
+            derived.add('popularity')
+        
+        if update_fields is not None:
+            kwargs['update_fields'] = update_fields | derived
         
         super().save(*args, **kwargs)
     
@@ -137,7 +227,7 @@ class BlogPost(models.Model):
             return False
         
         # Authors can always view their own posts
-        if self.author == user:
+        if self.author_id == user.pk:
             return True
         
         # Public published posts can be viewed by any authenticated user
@@ -147,6 +237,106 @@ class BlogPost(models.Model):
         return False
     
     def increment_view_count(self):
-        """Increment view count"""
+        """Increment view count with a single atomic UPDATE"""
+        BlogPost.objects.filter(pk=self.pk).update(
+            view_count=F('view_count') + 1, popularity=F('popularity') + 1
+        )
         self.view_count += 1
-        self.save(update_fields=['view_count'])
\ No newline at end of file
+        self.popularity += 1
+    
+    def record_view(self):
+        """
+        Count a view, buffering settings.VIEW_COUNT_BATCH_SIZE views in the
+        cache per UPDATE; view_count includes the buffered views. Partial
+        batches are written by flush_buffered_views().
+        """
+        batch_size = settings.VIEW_COUNT_BATCH_SIZE
+        if batch_size <= 1:
+            return self.increment_view_count()
+        
+        views = caches['post_views']
+        key = VIEW_COUNT_KEY_FORMAT % self.pk
+        views.add(key, 0, None)
+        try:
+            pending = views.incr(key)
+        except ValueError:
+            # Evicted since add(); don't lose this view
+            return self.increment_view_count()
+        
+        if pending == 1:
+            # The first view since the counter was last emptied
+            mark_views_pending(self.pk)
+        elif pending == batch_size:
+            # incr() is atomic, so exactly one view completes each batch;
+            # views counted meanwhile stay buffered for the next one
+            views.decr(key, batch_size)
+            BlogPost.objects.filter(pk=self.pk).add_views(batch_size)
+        # Below zero if a flush wrote views that a full batch wrote again;
+        # they are already on the row, so the next views just pay that back
+        pending = max(0, pending)
+        self.view_count += pending
+        self.popularity += pending
+    
+    @classmethod
+    def flush_buffered_views(cls, batch_size=500):
+        """
+        Write the buffered views of every post record_view() marked as
+        pending to view_count, and return how many were written; see the
+        flush_view_counts command
+        """
+        views = caches['post_views']
+        flushed = 0
+        while True:
+            pks = pop_posts_with_pending_views(batch_size)
+            if not pks:
+                return flushed
+            keys = {VIEW_COUNT_KEY_FORMAT % pk: pk for pk in pks}
+            for key, pending in views.get_many(keys).items():
+                if pending > 0:
+                    # decr() rather than delete(), so views counted since
+                    # get_many() stay buffered, and marked again
+                    if views.decr(key, pending) > 0:
+                        mark_views_pending(keys[key])
+                    cls.objects.filter(pk=keys[key]).add_views(pending)
+                    flushed += pending
+    
+    def increment_like_count(self):
+        """Increment like count with a single atomic UPDATE"""
+        BlogPost.objects.filter(pk=self.pk).update(
+            like_count=F('like_count') + 1, popularity=F('popularity') + 1
+        )
+        self.like_count += 1
+        self.popularity += 1
+    
+    def decrement_like_count(self):
+        """Decrement like count atomically, never going below zero"""
+        if BlogPost.objects.filter(pk=self.pk, like_count__gt=0).update(
+            like_count=F('like_count') - 1, popularity=F('popularity') - 1
+        ):
+            self.popularity = max(0, self.popularity - 1)
+        self.like_count = max(0, self.like_count - 1)
+
+class Like(models.Model):
+    """
+    A user's like of a post; BlogPost.like_count counts these
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='likes'
+    )
+    post = models.ForeignKey(
+        BlogPost,
+        on_delete=models.CASCADE,
+        related_name='likes'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        constraints = [
+            # Also serves the user/post lookup when toggling a like
+            models.UniqueConstraint(fields=['user', 'post'], name='uniq_like_user_post'),
+        ]
+    
+    def __str__(self):
+        return f"{self.user_id} likes {self.post_id}"
@@ -2,17 +2,20 @@
 from rest_framework import permissions
 from rest_framework.permissions import BasePermission
 
+# Set lookup instead of scanning DRF's tuple on every object check
+SAFE_METHODS = frozenset(permissions.SAFE_METHODS)
+
 class IsAuthorOrReadOnly(BasePermission):
     """
     Custom permission to only allow authors to edit their own posts
     """
     def has_object_permission(self, request, view, obj):
         # Read permissions for any authenticated user
-        if request.method in permissions.SAFE_METHODS:
+        if request.method in SAFE_METHODS:
             return True
         
-        # Write permissions only for the author
-        return obj.author == request.user
+        # Write permissions only for the author; comparing ids doesn't load obj.author
+        return obj.author_id == request.user.pk
 
 class CanViewPost(BasePermission):
     """
@@ -28,8 +31,8 @@ class IsCommentAuthorOrReadOnly(BasePermission):
     """
     def has_object_permission(self, request, view, obj):
         # Read permissions for any authenticated user
-        if request.method in permissions.SAFE_METHODS:
+        if request.method in SAFE_METHODS:
             return True
         
         # Write permissions only for the comment author
-        return obj.author == request.user
\ No newline at end of file
+        return obj.author_id == request.user.pk
\ No newline at end of file
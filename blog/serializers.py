@@ -1,9 +1,103 @@
 # ===== blog/serializers.py =====
 from rest_framework import serializers
-from django.utils import timezone
+from drf_spectacular.utils import extend_schema_field, inline_serializer
+from django.core.cache import cache
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, transaction
+from authentication.serializers import CachedFieldsMixin
+from .cache import POST_LIST_VERSION_KEY
 from .models import Category, Tag, BlogPost
 
-class CategorySerializer(serializers.ModelSerializer):
+# Formats datetimes exactly as the serializers' DateTimeFields do
+datetime_field = serializers.DateTimeField()
+
+def published_posts_count(obj):
+    """
+    Published, public posts in a category or tag; prefers the view's
+    _posts_count annotation over a COUNT per object
+    """
+    posts_count = getattr(obj, '_posts_count', None)
+    if posts_count is None:
+        posts_count = obj.posts.filter(status='published', is_public=True).count()
+    return posts_count
+
+def category_data(category):
+    """CategorySerializer's output, built without nested field binding"""
+    return {
+        'id': category.id,
+        'name': category.name,
+        'description': category.description,
+        'slug': category.slug,
+        'posts_count': published_posts_count(category),
+        'created_at': datetime_field.to_representation(category.created_at),
+    }
+
+def tag_data(tag):
+    """TagSerializer's output, built without nested field binding"""
+    return {
+        'id': tag.id,
+        'name': tag.name,
+        'slug': tag.slug,
+        'posts_count': published_posts_count(tag),
+        'created_at': datetime_field.to_representation(tag.created_at),
+    }
+
+def post_tags(post):
+    """
+    A post's tags; the views' tags_prefetch() list saves building a related
+    manager and queryset per post
+    """
+    tags = getattr(post, 'prefetched_tags', None)
+    return post.tags.all() if tags is None else tags
+
+def author_data(author):
+    """A post author's public profile, as a flat dict"""
+    return {
+        'id': author.id,
+        'username': author.username,
+        'full_name': author.full_name,
+        'avatar': author.avatar.url if author.avatar else None,
+        'bio': author.bio
+    }
+
+# Schema of author_data(), for the API docs
+author_schema = inline_serializer('PostAuthor', {
+    'id': serializers.IntegerField(),
+    'username': serializers.CharField(),
+    'full_name': serializers.CharField(),
+    'avatar': serializers.CharField(allow_null=True),
+    'bio': serializers.CharField(),
+})
+
+class BulkManyRelatedField(serializers.ManyRelatedField):
+    """
+    Many-related primary key field that looks up every submitted id with
+    one in_bulk() query instead of one query per item
+    """
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+        
+        child = self.child_relation
+        queryset = child.get_queryset()
+        pks = []
+        for pk in data:
+            if isinstance(pk, bool):
+                child.fail('incorrect_type', data_type=type(pk).__name__)
+            try:
+                pks.append(queryset.model._meta.pk.to_python(pk))
+            except (TypeError, ValueError, DjangoValidationError):
+                child.fail('incorrect_type', data_type=type(pk).__name__)
+        
+        instances = queryset.in_bulk(pks)
+        for pk in pks:
+            if pk not in instances:
+                child.fail('does_not_exist', pk_value=pk)
+        return [instances[pk] for pk in pks]
+
+class CategorySerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for Category model
     """
@@ -15,9 +109,9 @@ class CategorySerializer(serializers.ModelSerializer):
         read_only_fields = ['slug', 'created_at']
     
     def get_posts_count(self, obj):
-        return obj.posts.filter(status='published', is_public=True).count()
+        return published_posts_count(obj)
 
-class TagSerializer(serializers.ModelSerializer):
+class TagSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for Tag model
     """
@@ -29,16 +123,16 @@ class TagSerializer(serializers.ModelSerializer):
         read_only_fields = ['slug', 'created_at']
     
     def get_posts_count(self, obj):
-        return obj.posts.filter(status='published', is_public=True).count()
+        return published_posts_count(obj)
 
-class BlogPostListSerializer(serializers.ModelSerializer):
+class BlogPostListSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
     Lightweight serializer for blog post lists
     """
-    author_name = serializers.CharField(source='author.get_full_name', read_only=True)
+    author_name = serializers.CharField(source='author.full_name', read_only=True)
     author_username = serializers.CharField(source='author.username', read_only=True)
     category_name = serializers.CharField(source='category.name', read_only=True)
-    tags = TagSerializer(many=True, read_only=True)
+    tags = serializers.SerializerMethodField()
     comments_count = serializers.SerializerMethodField()
     reading_time = serializers.SerializerMethodField()
     
@@ -50,22 +144,32 @@ class BlogPostListSerializer(serializers.ModelSerializer):
             'publication_date', 'created_at', 'view_count', 'like_count',
             'comments_count', 'reading_time'
         ]
+        # Output only, so DRF needn't build validators for any field
+        read_only_fields = fields
+    
+    @extend_schema_field(TagSerializer(many=True))
+    def get_tags(self, obj):
+        # Flat dicts; a nested TagSerializer binds fields for every tag
+        return [tag_data(tag) for tag in post_tags(obj)]
     
     def get_comments_count(self, obj):
-        return obj.comments.filter(is_approved=True).count()
+        # Prefer the view's _comments_count annotation over a COUNT per object
+        comments_count = getattr(obj, '_comments_count', None)
+        if comments_count is None:
+            comments_count = obj.comments.filter(is_approved=True).count()
+        return comments_count
     
     def get_reading_time(self, obj):
         """Estimate reading time based on word count (250 words per minute)"""
-        word_count = len(obj.content.split())
-        return max(1, round(word_count / 250))
+        return max(1, round(obj.word_count / 250))
 
-class BlogPostDetailSerializer(serializers.ModelSerializer):
+class BlogPostDetailSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
     Detailed serializer for individual blog posts
     """
     author = serializers.SerializerMethodField()
-    category = CategorySerializer(read_only=True)
-    tags = TagSerializer(many=True, read_only=True)
+    category = serializers.SerializerMethodField()
+    tags = serializers.SerializerMethodField()
     comments_count = serializers.SerializerMethodField()
     reading_time = serializers.SerializerMethodField()
     
@@ -77,33 +181,42 @@ class BlogPostDetailSerializer(serializers.ModelSerializer):
             'featured_image', 'publication_date', 'created_at', 'updated_at',
             'view_count', 'like_count', 'comments_count', 'reading_time'
         ]
-        read_only_fields = [
-            'slug', 'view_count', 'like_count', 'created_at', 'updated_at'
-        ]
+        # Output only; writes go through BlogPostCreateUpdateSerializer
+        read_only_fields = fields
     
+    @extend_schema_field(author_schema)
     def get_author(self, obj):
-        return {
-            'id': obj.author.id,
-            'username': obj.author.username,
-            'full_name': obj.author.get_full_name(),
-            'avatar': obj.author.avatar.url if obj.author.avatar else None,
-            'bio': obj.author.bio
-        }
+        # Built once per author for each serialization context (request)
+        authors = self.context.setdefault('_author_cache', {})
+        author = authors.get(obj.author_id)
+        if author is None:
+            author = authors[obj.author_id] = author_data(obj.author)
+        return author
+    
+    @extend_schema_field(CategorySerializer(allow_null=True))
+    def get_category(self, obj):
+        return category_data(obj.category) if obj.category else None
+    
+    @extend_schema_field(TagSerializer(many=True))
+    def get_tags(self, obj):
+        return [tag_data(tag) for tag in post_tags(obj)]
     
     def get_comments_count(self, obj):
-        return obj.comments.filter(is_approved=True).count()
+        # Prefer the view's _comments_count annotation over a COUNT per object
+        comments_count = getattr(obj, '_comments_count', None)
+        if comments_count is None:
+            comments_count = obj.comments.filter(is_approved=True).count()
+        return comments_count
     
     def get_reading_time(self, obj):
-        word_count = len(obj.content.split())
-        return max(1, round(word_count / 250))
+        return max(1, round(obj.word_count / 250))
 
-class BlogPostCreateUpdateSerializer(serializers.ModelSerializer):
+class BlogPostCreateUpdateSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for creating and updating blog posts
     """
-    tags = serializers.PrimaryKeyRelatedField(
-        queryset=Tag.objects.all(),
-        many=True,
+    tags = BulkManyRelatedField(
+        child_relation=serializers.PrimaryKeyRelatedField(queryset=Tag.objects.all()),
         required=False
     )
     category = serializers.PrimaryKeyRelatedField(
@@ -118,29 +231,19 @@ class BlogPostCreateUpdateSerializer(serializers.ModelSerializer):
             'title', 'content', 'excerpt', 'category', 'tags',
             'is_public', 'status', 'meta_description', 'featured_image'
         ]
-    
-    def validate_title(self, value):
-        """Validate title length and uniqueness for the author"""
-        if len(value.strip()) < 5:
-            raise serializers.ValidationError("Title must be at least 5 characters long.")
-        
-        # Check for duplicate titles by the same author (excluding current instance)
-        user = self.context['request'].user
-        queryset = BlogPost.objects.filter(author=user, title=value)
-        
-        if self.instance:
-            queryset = queryset.exclude(pk=self.instance.pk)
-        
-        if queryset.exists():
-            raise serializers.ValidationError("You already have a post with this title.")
-        
-        return value.strip()
-    
-    def validate_content(self, value):
-        """Validate content length"""
-        if len(value.strip()) < 100:
-            raise serializers.ValidationError("Content must be at least 100 characters long.")
-        return value.strip()
+        # CharField trims whitespace before its validators run, so the
+        # minimum lengths apply to the stripped values without extra copies.
+        # Per-author title uniqueness is checked on save.
+        extra_kwargs = {
+            'title': {
+                'min_length': 5,
+                'error_messages': {'min_length': "Title must be at least 5 characters long."}
+            },
+            'content': {
+                'min_length': 100,
+                'error_messages': {'min_length': "Content must be at least 100 characters long."}
+            },
+        }
     
     def validate_tags(self, value):
         """Validate tags count"""
@@ -153,8 +256,19 @@ class BlogPostCreateUpdateSerializer(serializers.ModelSerializer):
         tags = validated_data.pop('tags', [])
         validated_data['author'] = self.context['request'].user
         
-        post = BlogPost.objects.create(**validated_data)
-        post.tags.set(tags)
+        post = BlogPost(**validated_data)
+        self._save_post(post)
+        
+        # A new post has no tags to diff against, so link them all with one
+        # INSERT. bulk_create() sends no m2m_changed, and a list cached since
+        # post_save dropped the version shows the post without its tags, so
+        # drop it again once they are linked.
+        if tags:
+            PostTag = BlogPost.tags.through
+            PostTag.objects.bulk_create([
+                PostTag(blogpost_id=post.pk, tag_id=tag.pk) for tag in dict.fromkeys(tags)
+            ])
+            cache.delete(POST_LIST_VERSION_KEY)
         return post
     
     def update(self, instance, validated_data):
@@ -164,9 +278,28 @@ class BlogPostCreateUpdateSerializer(serializers.ModelSerializer):
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
         
-        instance.save()
+        self._save_post(instance)
         
         if tags is not None:
             instance.tags.set(tags)
         
         return instance
+    
+    def _save_post(self, post):
+        """
+        Save the post, turning a uniq_author_title violation into a title error.
+        The database enforces the constraint, so no SELECT is needed up front.
+        """
+        try:
+            with transaction.atomic():
+                post.save()
+        except IntegrityError:
+            # Only reached on failure: tell the title clash apart from others
+            duplicate = BlogPost.objects.filter(author=post.author_id, title=post.title)
+            if post.pk:
+                duplicate = duplicate.exclude(pk=post.pk)
+            if not duplicate.exists():
+                raise
+            raise serializers.ValidationError(
+                {'title': ["You already have a post with this title."]}
+            )
@@ -0,0 +1,26 @@
+# ===== blog/signals.py =====
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from .cache import POST_LIST_VERSION_KEY
+from .filters import FILTER_CHOICES_KEY_FORMAT
+from .models import BlogPost, Category, Tag
+
+@receiver([post_save, post_delete], sender=Category)
+@receiver([post_save, post_delete], sender=Tag)
+def clear_filter_choices(sender, **kwargs):
+    """
+    Drop the cached filter ids when a category or tag is added or removed
+    """
+    cache.delete(FILTER_CHOICES_KEY_FORMAT % sender._meta.model_name)
+
+@receiver([post_save, post_delete], sender=BlogPost)
+@receiver([post_save, post_delete], sender='comments.Comment')
+@receiver([post_save, post_delete], sender=Category)
+@receiver([post_save, post_delete], sender=Tag)
+@receiver(m2m_changed, sender=BlogPost.tags.through)
+def clear_post_lists(sender, **kwargs):
+    """
+    Start a new post list version so cached lists and ETags go stale
+    """
+    cache.delete(POST_LIST_VERSION_KEY)
@@ -0,0 +1,61 @@
+import copy
+from types import SimpleNamespace
+
+import pytest
+from django.db import transaction
+from .factories import UserFactory, CategoryFactory, TagFactory, BlogPostFactory
+
+
+@pytest.fixture(scope='module')
+def blog_data(django_db_setup, django_db_blocker):
+    """
+    Rows shared by all tests in a module, like TestCase.setUpTestData: they
+    are created once inside a transaction that is rolled back afterwards,
+    and each test runs in a savepoint within it. pytest.ini's
+    --dist=loadscope keeps a module on one xdist worker, so they are built
+    once per module rather than once per worker the tests are spread over
+    """
+    with django_db_blocker.unblock():
+        atomic = transaction.atomic()
+        atomic.__enter__()
+        user = UserFactory()
+        category = CategoryFactory()
+        tag = TagFactory()
+        post = BlogPostFactory(author=user, category=category, tags=[tag])
+
+    yield SimpleNamespace(user=user, category=category, tag=tag, post=post)
+
+    with django_db_blocker.unblock():
+        transaction.set_rollback(True)
+        atomic.__exit__(None, None, None)
+
+
+# Each test gets its own copies, so changes to the instances don't leak
+# between tests (as with setUpTestData attributes)
+
+@pytest.fixture
+def user(db, blog_data):
+    """An author with a full name"""
+    return copy.deepcopy(blog_data.user)
+
+
+@pytest.fixture
+def category(db, blog_data):
+    return copy.deepcopy(blog_data.category)
+
+
+@pytest.fixture
+def tag(db, blog_data):
+    return copy.deepcopy(blog_data.tag)
+
+
+@pytest.fixture
+def post(db, blog_data):
+    """A published, public post by `user` in `category`, tagged with `tag`"""
+    return copy.deepcopy(blog_data.post)
+
+
+@pytest.fixture
+def request_ctx(user):
+    """Serializer context whose request is made by `user`"""
+    return {'request': SimpleNamespace(user=user)}
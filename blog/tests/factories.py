@@ -0,0 +1,60 @@
+import factory
+from django.contrib.auth import get_user_model
+from django.utils.text import slugify
+from blog.models import Category, Tag, BlogPost
+
+
+class UserFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = get_user_model()
+        django_get_or_create = ('username',)
+
+    username = 'testuser'
+    email = factory.LazyAttribute(lambda user: f'{user.username}@example.com')
+    first_name = 'Test'
+    last_name = 'User'
+    # Unusable, so no hasher runs; pass a password to tests that log in
+    password = factory.django.Password(None)
+
+
+class CategoryFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Category
+        django_get_or_create = ('name',)
+
+    name = 'Technology'
+    description = 'Technology related posts'
+    # Set here as well as in save(), for build() + bulk_create()
+    slug = factory.LazyAttribute(lambda category: slugify(category.name))
+
+
+class TagFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Tag
+        django_get_or_create = ('name',)
+
+    name = 'Python'
+    slug = factory.LazyAttribute(lambda tag: slugify(tag.name))
+
+
+class BlogPostFactory(factory.django.DjangoModelFactory):
+    """A published, public post"""
+    class Meta:
+        model = BlogPost
+        # The tags hook only adds m2m rows, so the post needn't be saved again
+        skip_postgeneration_save = True
+
+    title = 'Test Blog Post'
+    slug = factory.LazyAttribute(lambda post: slugify(post.title))
+    content = 'This is a test blog post content that should be long enough to generate an excerpt.'
+    excerpt = 'This is a test blog post content...'
+    author = factory.SubFactory(UserFactory)
+    category = factory.SubFactory(CategoryFactory)
+    status = BlogPost.PUBLISHED
+    is_public = True
+    meta_description = 'Test meta description'
+
+    @factory.post_generation
+    def tags(post, create, extracted, **kwargs):
+        if create and extracted:
+            post.tags.add(*extracted)
@@ -0,0 +1,39 @@
+from io import StringIO
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db.models import F
+from django.test import TestCase, override_settings
+from ..cache import PENDING_VIEWS_KEY
+from ..models import BlogPost, VIEW_COUNT_KEY_FORMAT
+from .factories import BlogPostFactory
+
+
+class ManagementCommandsTest(TestCase):
+    def test_generate_sample_data_sets_popularity(self):
+        """Test that bulk-created sample posts store popularity as views + likes"""
+        call_command('generate_sample_data', users=2, posts=10, categories=2, tags=5, seed=1, stdout=StringIO())
+        
+        posts = BlogPost.objects.all()
+        self.assertEqual(posts.count(), 10)
+        self.assertFalse(posts.exclude(popularity=F('view_count') + F('like_count')).exists())
+
+    @override_settings(VIEW_COUNT_BATCH_SIZE=3)
+    def test_flush_view_counts_writes_partial_batches(self):
+        """Test that views buffered short of a full batch are written and drained"""
+        caches['post_views'].clear()
+        post = BlogPostFactory()
+        BlogPostFactory(title='Unviewed Post')
+        post.record_view()
+        post.record_view()
+        # Only posts with buffered views are queued for the flush
+        self.assertEqual(caches['post_views'].get(PENDING_VIEWS_KEY), {post.pk})
+        
+        call_command('flush_view_counts', stdout=StringIO())
+        
+        post.refresh_from_db()
+        self.assertEqual((post.view_count, post.popularity), (2, 2))
+        self.assertEqual(caches['post_views'].get(VIEW_COUNT_KEY_FORMAT % post.pk), 0)
+        self.assertEqual(BlogPost.flush_buffered_views(), 0)
+        
+        post.record_view()
+        self.assertEqual(BlogPost.flush_buffered_views(), 1)
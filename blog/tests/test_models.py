@@ -1,9 +1,12 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.core.cache import caches
+from django.db import IntegrityError, transaction
+from django.db.models import Q
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from django.urls import reverse
 from django.core.exceptions import ValidationError
-from ..models import Category, Tag, BlogPost
+from ..models import Category, Tag, BlogPost, Like, VIEW_COUNT_KEY_FORMAT
 import tempfile
 import os
 from PIL import Image
@@ -279,6 +282,23 @@ class BlogPostModelTest(TestCase):
         self.assertFalse(post.can_be_viewed_by(other_user))
         self.assertTrue(post.can_be_viewed_by(self.user))  # Author can still view
 
+    def test_blog_post_viewable_by(self):
+        """Test that viewable_by matches can_be_viewed_by"""
+        from django.contrib.auth.models import AnonymousUser
+        other_user = User.objects.create_user(
+            email='other@example.com',
+            username='otheruser',
+            password='testpass123'
+        )
+        public_post = BlogPost.objects.create(**self.post_data)
+        draft_post = BlogPost.objects.create(author=self.user, title='Draft Post', content='Draft content', status='draft')
+        private_post = BlogPost.objects.create(author=self.user, title='Private Post', content='Private content', is_public=False)
+        
+        for user in (self.user, other_user, AnonymousUser()):
+            viewable = set(BlogPost.objects.viewable_by(user))
+            for post in (public_post, draft_post, private_post):
+                self.assertEqual(post in viewable, post.can_be_viewed_by(user))
+
     def test_blog_post_increment_view_count(self):
         """Test increment_view_count method"""
         post = BlogPost.objects.create(**self.post_data)
@@ -289,6 +309,114 @@ class BlogPostModelTest(TestCase):
         
         self.assertEqual(post.view_count, initial_count + 1)
 
+    def test_blog_post_word_count(self):
+        """Test that word_count is kept in step with content on save"""
+        post = BlogPost.objects.create(**self.post_data)
+        self.assertEqual(post.word_count, len(self.post_data['content'].split()))
+        
+        post.content = 'Just four words here'
+        post.save()
+        post.refresh_from_db()
+        self.assertEqual(post.word_count, 4)
+
+    def test_blog_post_save_skips_unchanged_content(self):
+        """Test that saving without touching content skips loading and re-counting it"""
+        post = BlogPost.objects.create(**self.post_data)
+        
+        post = BlogPost.objects.get(pk=post.pk)
+        post.word_count = 0
+        post.title = 'Renamed Post'
+        post.save()
+        self.assertEqual(post.word_count, 0)
+        
+        post = BlogPost.objects.defer('content').get(pk=post.pk)
+        with self.assertNumQueries(1):
+            post.save()
+
+    def test_blog_post_save_update_fields(self):
+        """Test that targeted saves only refresh fields derived from the saved columns"""
+        post = BlogPost.objects.create(**self.post_data)
+        BlogPost.objects.filter(pk=post.pk).update(excerpt='')
+        post = BlogPost.objects.get(pk=post.pk)
+        
+        post.view_count = 5
+        post.save(update_fields=['view_count'])
+        self.assertEqual(post.excerpt, '')
+        
+        post.content = 'Fresh content for the post ' * 4
+        post.save(update_fields=['content'])
+        post.refresh_from_db()
+        self.assertEqual(post.word_count, 20)
+        self.assertTrue(post.excerpt.startswith('Fresh content'))
+
+    def test_blog_post_increment_view_count_concurrent(self):
+        """Test that increments from stale instances aren't lost"""
+        post = BlogPost.objects.create(**self.post_data)
+        first = BlogPost.objects.get(pk=post.pk)
+        second = BlogPost.objects.get(pk=post.pk)
+        
+        first.increment_view_count()
+        second.increment_view_count()
+        post.refresh_from_db()
+        
+        self.assertEqual(post.view_count, 2)
+
+    @override_settings(VIEW_COUNT_BATCH_SIZE=3)
+    def test_blog_post_record_view_batches_updates(self):
+        """Test that buffered views are written once per batch"""
+        post = BlogPost.objects.create(**self.post_data)
+        caches['post_views'].delete(VIEW_COUNT_KEY_FORMAT % post.pk)
+        
+        for expected in (1, 2):
+            viewer = BlogPost.objects.get(pk=post.pk)
+            with self.assertNumQueries(0):
+                viewer.record_view()
+            self.assertEqual(viewer.view_count, expected)
+        post.refresh_from_db()
+        self.assertEqual(post.view_count, 0)
+        
+        with self.assertNumQueries(1):
+            post.record_view()
+        post.refresh_from_db()
+        self.assertEqual(post.view_count, 3)
+
+    def test_blog_post_like_count_never_negative(self):
+        """Test like count increments and stops decrementing at zero"""
+        post = BlogPost.objects.create(**self.post_data)
+        
+        post.increment_like_count()
+        post.decrement_like_count()
+        post.decrement_like_count()
+        self.assertEqual(post.like_count, 0)
+        
+        post.refresh_from_db()
+        self.assertEqual(post.like_count, 0)
+
+    def test_blog_post_popularity_follows_counts(self):
+        """Test that popularity stays view_count + like_count however the counts change"""
+        post = BlogPost.objects.create(**self.post_data, view_count=2, like_count=1)
+        self.assertEqual(post.popularity, 3)
+        
+        post.increment_view_count()
+        post.increment_like_count()
+        post.decrement_like_count()
+        post.refresh_from_db()
+        self.assertEqual(post.popularity, 4)
+        
+        post.like_count = 6
+        post.save(update_fields=['like_count'])
+        post.refresh_from_db()
+        self.assertEqual(post.popularity, post.view_count + post.like_count)
+
+    def test_like_unique_per_user_and_post(self):
+        """Test that a user can like a post only once"""
+        post = BlogPost.objects.create(**self.post_data)
+        Like.objects.create(user=self.user, post=post)
+        
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Like.objects.create(user=self.user, post=post)
+        self.assertEqual(post.likes.count(), 1)
+
     def test_blog_post_with_featured_image(self):
         """Test blog post with featured image"""
         # Test that blog post can be created without featured image
@@ -307,9 +435,12 @@ class BlogPostModelTest(TestCase):
         indexes = post._meta.indexes
         index_fields = [index.fields for index in indexes]
         
-        self.assertIn(['status', 'is_public'], index_fields)
+        self.assertIn(['-created_at'], index_fields)
         self.assertIn(['publication_date'], index_fields)
         self.assertIn(['author', 'created_at'], index_fields)
+        
+        published_public = next(index for index in indexes if index.name == 'idx_published_public')
+        self.assertEqual(published_public.condition, Q(status='published', is_public=True))
 
     def test_blog_post_relationships(self):
         """Test blog post relationships"""
@@ -1,510 +1,489 @@
-from django.test import TestCase
-from django.contrib.auth import get_user_model
-from django.utils import timezone
-from rest_framework.test import APITestCase
-from rest_framework import serializers
+import factory
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.db.models.signals import post_save
+from django.test.utils import CaptureQueriesContext
 from blog.serializers import (
     CategorySerializer, TagSerializer, BlogPostListSerializer,
     BlogPostDetailSerializer, BlogPostCreateUpdateSerializer
 )
-from blog.models import Category, Tag, BlogPost
-import tempfile
-import os
-from PIL import Image
+from blog.cache import POST_LIST_VERSION_KEY, post_list_version
+from blog.models import Tag, BlogPost
+from blog.views import with_list_counts
+from .factories import TagFactory, BlogPostFactory
 from django.core.files.uploadedfile import SimpleUploadedFile
 
-User = get_user_model()
-
-
-class CategorySerializerTest(TestCase):
-    """Test cases for CategorySerializer"""
-
-    def setUp(self):
-        """Set up test data"""
-        self.category = Category.objects.create(
-            name='Technology',
-            description='Technology related posts',
-            slug='technology'
-        )
-
-    def test_category_serializer_fields(self):
-        """Test that CategorySerializer includes all expected fields"""
-        serializer = CategorySerializer(self.category)
-        actual_fields = set(serializer.data.keys())
-        
-        expected_fields = {
-            'id', 'name', 'description', 'slug', 'posts_count', 'created_at'
-        }
-        
-        self.assertEqual(actual_fields, expected_fields)
-
-    def test_category_serializer_data(self):
-        """Test that CategorySerializer correctly serializes data"""
-        serializer = CategorySerializer(self.category)
-        data = serializer.data
-        
-        self.assertEqual(data['name'], 'Technology')
-        self.assertEqual(data['description'], 'Technology related posts')
-        self.assertEqual(data['slug'], 'technology')
-        self.assertEqual(data['posts_count'], 0)
-        self.assertIn('created_at', data)
-
-    def test_category_serializer_posts_count(self):
-        """Test that posts_count is computed correctly"""
-        # Create a user and blog post
-        user = User.objects.create_user(
-            username='testuser',
-            email='test@example.com',
-            password='testpass123'
-        )
-        
-        post = BlogPost.objects.create(
-            title='Test Post',
-            slug='test-post',
-            content='Test content',
-            author=user,
-            category=self.category,
-            status='published',
-            is_public=True
-        )
-        
-        serializer = CategorySerializer(self.category)
-        self.assertEqual(serializer.data['posts_count'], 1)
-
-    def test_category_serializer_read_only_fields(self):
-        """Test that read-only fields cannot be modified"""
-        data = {
-            'name': 'Updated Technology',
-            'description': 'Updated description',
-            'slug': 'updated-slug'
-        }
-        
-        serializer = CategorySerializer(self.category, data=data, partial=True)
-        self.assertTrue(serializer.is_valid())
-        
-        # Slug should remain unchanged as it's read-only
-        updated_category = serializer.save()
-        self.assertEqual(updated_category.slug, 'technology')  # Original slug
-
-
-class TagSerializerTest(TestCase):
-    """Test cases for TagSerializer"""
-
-    def setUp(self):
-        """Set up test data"""
-        self.tag = Tag.objects.create(
-            name='Python',
-            slug='python'
-        )
-
-    def test_tag_serializer_fields(self):
-        """Test that TagSerializer includes all expected fields"""
-        serializer = TagSerializer(self.tag)
-        actual_fields = set(serializer.data.keys())
-        
-        expected_fields = {
-            'id', 'name', 'slug', 'posts_count', 'created_at'
-        }
-        
-        self.assertEqual(actual_fields, expected_fields)
-
-    def test_tag_serializer_data(self):
-        """Test that TagSerializer correctly serializes data"""
-        serializer = TagSerializer(self.tag)
-        data = serializer.data
-        
-        self.assertEqual(data['name'], 'Python')
-        self.assertEqual(data['slug'], 'python')
-        self.assertEqual(data['posts_count'], 0)
-        self.assertIn('created_at', data)
-
-    def test_tag_serializer_posts_count(self):
-        """Test that posts_count is computed correctly"""
-        # Create a user, category, and blog post
-        user = User.objects.create_user(
-            username='testuser',
-            email='test@example.com',
-            password='testpass123'
-        )
-        
-        category = Category.objects.create(
-            name='Technology',
-            description='Technology related posts',
-            slug='technology'
-        )
-        
-        post = BlogPost.objects.create(
-            title='Test Post',
-            slug='test-post',
-            content='Test content',
-            author=user,
-            category=category,
-            status='published',
-            is_public=True
-        )
-        post.tags.add(self.tag)
-        
-        serializer = TagSerializer(self.tag)
-        self.assertEqual(serializer.data['posts_count'], 1)
-
-
-class BlogPostListSerializerTest(TestCase):
-    """Test cases for BlogPostListSerializer"""
-
-    def setUp(self):
-        """Set up test data"""
-        self.user = User.objects.create_user(
-            username='testuser',
-            email='test@example.com',
-            password='testpass123',
-            first_name='Test',
-            last_name='User'
-        )
-        
-        self.category = Category.objects.create(
-            name='Technology',
-            description='Technology related posts',
-            slug='technology'
-        )
-        
-        self.tag = Tag.objects.create(
-            name='Python',
-            slug='python'
-        )
-        
-        self.post = BlogPost.objects.create(
-            title='Test Blog Post',
-            slug='test-blog-post',
-            content='This is a test blog post content that should be long enough to generate an excerpt.',
-            excerpt='This is a test blog post content...',
-            author=self.user,
-            category=self.category,
-            status='published',
-            is_public=True
-        )
-        self.post.tags.add(self.tag)
-
-    def test_blog_post_list_serializer_fields(self):
-        """Test that BlogPostListSerializer includes expected fields"""
-        serializer = BlogPostListSerializer(self.post)
-        actual_fields = set(serializer.data.keys())
-        
-        expected_fields = {
-            'id', 'title', 'slug', 'excerpt', 'author_name', 'author_username',
-            'category_name', 'tags', 'is_public', 'status', 'featured_image',
-            'publication_date', 'created_at', 'view_count', 'like_count',
-            'comments_count', 'reading_time'
-        }
-        
-        self.assertEqual(actual_fields, expected_fields)
-
-    def test_blog_post_list_serializer_data(self):
-        """Test that BlogPostListSerializer correctly serializes data"""
-        serializer = BlogPostListSerializer(self.post)
-        data = serializer.data
-        
-        self.assertEqual(data['title'], 'Test Blog Post')
-        self.assertEqual(data['slug'], 'test-blog-post')
-        self.assertEqual(data['excerpt'], 'This is a test blog post content...')
-        self.assertEqual(data['author_name'], 'Test User')
-        self.assertEqual(data['author_username'], 'testuser')
-        self.assertEqual(data['category_name'], 'Technology')
-        self.assertEqual(data['status'], 'published')
-        self.assertTrue(data['is_public'])
-        self.assertEqual(data['view_count'], 0)
-        self.assertEqual(data['like_count'], 0)
-        self.assertEqual(data['comments_count'], 0)
-
-    def test_blog_post_list_serializer_author_field(self):
-        """Test blog post list serializer author field"""
-        serializer = BlogPostListSerializer(self.post)
-        self.assertEqual(serializer.data['author_name'], 'Test User')
-        self.assertEqual(serializer.data['author_username'], 'testuser')
-
-    def test_blog_post_list_serializer_category_field(self):
-        """Test blog post list serializer category field"""
-        serializer = BlogPostListSerializer(self.post)
-        self.assertEqual(serializer.data['category_name'], 'Technology')
-
-    def test_blog_post_list_serializer_tags_field(self):
-        """Test blog post list serializer tags field"""
-        serializer = BlogPostListSerializer(self.post)
-        tags_data = serializer.data['tags']
-        self.assertEqual(len(tags_data), 1)
-        self.assertEqual(tags_data[0]['name'], 'Python')
-
-    def test_blog_post_list_serializer_reading_time(self):
-        """Test that reading_time is computed correctly"""
-        serializer = BlogPostListSerializer(self.post)
-        # Content has about 15 words, so reading time should be 1 minute
-        self.assertEqual(serializer.data['reading_time'], 1)
-
-    def test_blog_post_list_serializer_comments_count(self):
-        """Test that comments_count is computed correctly"""
-        serializer = BlogPostListSerializer(self.post)
-        self.assertEqual(serializer.data['comments_count'], 0)
-
-
-class BlogPostDetailSerializerTest(TestCase):
-    """Test cases for BlogPostDetailSerializer"""
-
-    def setUp(self):
-        """Set up test data"""
-        self.user = User.objects.create_user(
-            username='testuser',
-            email='test@example.com',
-            password='testpass123',
-            first_name='Test',
-            last_name='User'
-        )
-        
-        self.category = Category.objects.create(
-            name='Technology',
-            description='Technology related posts',
-            slug='technology'
-        )
-        
-        self.tag = Tag.objects.create(
-            name='Python',
-            slug='python'
-        )
-        
-        self.post = BlogPost.objects.create(
-            title='Test Blog Post',
-            slug='test-blog-post',
-            content='This is a test blog post content that should be long enough to generate an excerpt.',
-            excerpt='This is a test blog post content...',
-            author=self.user,
-            category=self.category,
-            status='published',
-            is_public=True,
-            meta_description='Test meta description'
-        )
-        self.post.tags.add(self.tag)
-
-    def test_blog_post_detail_serializer_fields(self):
-        """Test that BlogPostDetailSerializer includes all fields"""
-        serializer = BlogPostDetailSerializer(self.post)
-        actual_fields = set(serializer.data.keys())
-        
-        expected_fields = {
-            'id', 'title', 'slug', 'content', 'excerpt', 'author',
-            'category', 'tags', 'is_public', 'status', 'meta_description',
-            'featured_image', 'publication_date', 'created_at', 'updated_at',
-            'view_count', 'like_count', 'comments_count', 'reading_time'
-        }
-        
-        self.assertEqual(actual_fields, expected_fields)
-
-    def test_blog_post_detail_serializer_data(self):
-        """Test that BlogPostDetailSerializer correctly serializes data"""
-        serializer = BlogPostDetailSerializer(self.post)
-        data = serializer.data
-        
-        self.assertEqual(data['title'], 'Test Blog Post')
-        self.assertEqual(data['slug'], 'test-blog-post')
-        self.assertEqual(data['content'], 'This is a test blog post content that should be long enough to generate an excerpt.')
-        self.assertEqual(data['excerpt'], 'This is a test blog post content...')
-        self.assertEqual(data['status'], 'published')
-        self.assertTrue(data['is_public'])
-        self.assertEqual(data['meta_description'], 'Test meta description')
-        self.assertEqual(data['view_count'], 0)
-        self.assertEqual(data['like_count'], 0)
-        self.assertEqual(data['comments_count'], 0)
-
-    def test_blog_post_detail_serializer_author_field(self):
-        """Test blog post detail serializer author field"""
-        serializer = BlogPostDetailSerializer(self.post)
-        author_data = serializer.data['author']
-        self.assertEqual(author_data['username'], 'testuser')
-        self.assertEqual(author_data['full_name'], 'Test User')
-
-    def test_blog_post_detail_serializer_category_field(self):
-        """Test blog post detail serializer category field"""
-        serializer = BlogPostDetailSerializer(self.post)
-        category_data = serializer.data['category']
-        self.assertEqual(category_data['name'], 'Technology')
-        self.assertEqual(category_data['description'], 'Technology related posts')
-
-    def test_blog_post_detail_serializer_tags_field(self):
-        """Test blog post detail serializer tags field"""
-        serializer = BlogPostDetailSerializer(self.post)
-        tags_data = serializer.data['tags']
-        self.assertEqual(len(tags_data), 1)
-        self.assertEqual(tags_data[0]['name'], 'Python')
+# A 1x1 greyscale JPEG; enough for ImageField's Pillow check
+_MIN_JPEG = bytes.fromhex(
+    'ffd8ffe000104a46494600010100000100010000ffdb004300ffffffffffffff'
+    'ffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffff'
+    'ffffffffffffffffffffffffffffffffffffffffffffffffffffffc0000b0800'
+    '01000101011100ffc40014000100000000000000000000000000000003ffc400'
+    '14100100000000000000000000000000000000ffda0008010100003f0037ffd9'
+)
+
+pytestmark = pytest.mark.django_db
+
+# Marks a field to leave out of the submitted data
+MISSING = object()
+
+
+# CategorySerializer
+
+def test_category_serializer_fields(category):
+    """Test that CategorySerializer includes all expected fields"""
+    serializer = CategorySerializer(category)
+    actual_fields = set(serializer.data.keys())
+
+    expected_fields = {
+        'id', 'name', 'description', 'slug', 'posts_count', 'created_at'
+    }
+
+    assert actual_fields == expected_fields
+
+
+def test_category_serializer_data(category):
+    """Test that CategorySerializer correctly serializes data"""
+    serializer = CategorySerializer(category)
+    data = serializer.data
+
+    assert data['name'] == 'Technology'
+    assert data['description'] == 'Technology related posts'
+    assert data['slug'] == 'technology'
+    assert data['posts_count'] == 1  # the shared post
+    assert 'created_at' in data
+
+
+def test_category_serializer_posts_count(user, category, django_assert_num_queries):
+    """Test that posts_count is computed correctly"""
+    # Counting only needs the row: bulk_create skips save() and its signals
+    BlogPost.objects.bulk_create([
+        BlogPostFactory.build(title='Test Post', author=user, category=category)
+    ])
+
+    serializer = CategorySerializer(category)
+    # Without the view's _posts_count annotation: one COUNT
+    with django_assert_num_queries(1):
+        assert serializer.data['posts_count'] == 2
+
+
+def test_category_serializer_read_only_fields(category):
+    """Test that read-only fields cannot be modified"""
+    data = {
+        'name': 'Updated Technology',
+        'description': 'Updated description',
+        'slug': 'updated-slug'
+    }
+
+    serializer = CategorySerializer(category, data=data, partial=True)
+    assert serializer.is_valid()
+
+    # Slug should remain unchanged as it's read-only
+    updated_category = serializer.save()
+    assert updated_category.slug == 'technology'  # Original slug
+
+
+# TagSerializer
+
+def test_tag_serializer_fields(tag):
+    """Test that TagSerializer includes all expected fields"""
+    serializer = TagSerializer(tag)
+    actual_fields = set(serializer.data.keys())
+
+    expected_fields = {
+        'id', 'name', 'slug', 'posts_count', 'created_at'
+    }
+
+    assert actual_fields == expected_fields
+
+
+def test_tag_serializer_data(tag):
+    """Test that TagSerializer correctly serializes data"""
+    serializer = TagSerializer(tag)
+    data = serializer.data
+
+    assert data['name'] == 'Python'
+    assert data['slug'] == 'python'
+    assert data['posts_count'] == 1  # the shared post
+    assert 'created_at' in data
+
+
+def test_tag_serializer_posts_count(user, category, tag):
+    """Test that posts_count is computed correctly"""
+    post, = BlogPost.objects.bulk_create([
+        BlogPostFactory.build(title='Test Post', author=user, category=category)
+    ])
+    # The through row directly, without tags.add()'s lookup and m2m_changed
+    BlogPost.tags.through.objects.create(blogpost=post, tag=tag)
+
+    serializer = TagSerializer(tag)
+    assert serializer.data['posts_count'] == 2
+
+
+# BlogPostListSerializer
 
-    def test_blog_post_detail_serializer_read_only_fields(self):
-        """Test that read-only fields are present but not modifiable"""
-        serializer = BlogPostDetailSerializer(self.post)
+@pytest.fixture(scope='module')
+def list_data(blog_data, django_db_blocker):
+    """The shared post serialized once for the module's read-only checks"""
+    with django_db_blocker.unblock():
+        return BlogPostListSerializer(blog_data.post).data
+
+
+def test_blog_post_list_serializer_fields(list_data):
+    """Test that BlogPostListSerializer includes expected fields"""
+    actual_fields = set(list_data.keys())
+
+    expected_fields = {
+        'id', 'title', 'slug', 'excerpt', 'author_name', 'author_username',
+        'category_name', 'tags', 'is_public', 'status', 'featured_image',
+        'publication_date', 'created_at', 'view_count', 'like_count',
+        'comments_count', 'reading_time'
+    }
+
+    assert actual_fields == expected_fields
+
+
+def test_blog_post_list_serializer_data(post, django_assert_num_queries):
+    """Test that BlogPostListSerializer correctly serializes data"""
+    serializer = BlogPostListSerializer(post)
+    # Unannotated post: its tags, the tag's post count and the comment count
+    with django_assert_num_queries(3):
         data = serializer.data
-        
-        # These fields should be present
-        self.assertIn('slug', data)
-        self.assertIn('view_count', data)
-        self.assertIn('like_count', data)
-        self.assertIn('created_at', data)
-        self.assertIn('updated_at', data)
-
-
-class BlogPostCreateUpdateSerializerTest(TestCase):
-    """Test cases for BlogPostCreateUpdateSerializer"""
-
-    def setUp(self):
-        self.user = User.objects.create_user(username='testuser', email='test@example.com', password='testpass123')
-        self.category = Category.objects.create(name='Technology', description='Technology related posts', slug='technology')
-        self.tag = Tag.objects.create(name='Python', slug='python')
-        self.post = BlogPost.objects.create(
-            title='Test Blog Post', slug='test-blog-post',
-            content='This is a test blog post content that should be long enough to meet the minimum requirement. '*3,
-            excerpt='This is a test blog post content...', author=self.user, category=self.category,
-            status='published', is_public=True
-        )
-        self.post.tags.add(self.tag)
-
-    def test_blog_post_create_update_serializer_fields(self):
-        """Test that BlogPostCreateUpdateSerializer includes expected fields"""
-        serializer = BlogPostCreateUpdateSerializer()
-        actual_fields = set(serializer.fields.keys())
-        
-        expected_fields = {
-            'title', 'content', 'excerpt', 'category', 'tags',
-            'is_public', 'status', 'meta_description', 'featured_image'
-        }
-        
-        self.assertEqual(actual_fields, expected_fields)
-
-    def test_blog_post_create_update_serializer_valid_data(self):
-        data = {
-            'title': 'New Blog Post',
-            'content': 'This is a new blog post content that meets the minimum length requirement. '*3,
-            'excerpt': 'New blog post excerpt',
-            'category': self.category.id,
-            'tags': [self.tag.id],
-            'is_public': True,
-            'status': 'draft'
-        }
-        serializer = BlogPostCreateUpdateSerializer(data=data, context={'request': type('Request', (), {'user': self.user})()})
-        self.assertTrue(serializer.is_valid())
-
-    def test_blog_post_create_update_serializer_missing_title(self):
-        """Test that BlogPostCreateUpdateSerializer requires title"""
-        data = {
-            'content': 'This is a blog post content without title.',
-            'category': self.category.id
-        }
-        
-        serializer = BlogPostCreateUpdateSerializer(data=data, context={'request': type('Request', (), {'user': self.user})()})
-        self.assertFalse(serializer.is_valid())
-        self.assertIn('title', serializer.errors)
-
-    def test_blog_post_create_update_serializer_missing_content(self):
-        """Test that BlogPostCreateUpdateSerializer requires content"""
-        data = {
-            'title': 'Blog Post Without Content',
-            'category': self.category.id
-        }
-        
-        serializer = BlogPostCreateUpdateSerializer(data=data, context={'request': type('Request', (), {'user': self.user})()})
-        self.assertFalse(serializer.is_valid())
-        self.assertIn('content', serializer.errors)
-
-    def test_blog_post_create_update_serializer_title_too_short(self):
-        """Test that BlogPostCreateUpdateSerializer validates title length"""
-        data = {
-            'title': 'Hi',  # Too short
-            'content': 'This is a blog post content that meets the minimum length requirement.',
-            'category': self.category.id
-        }
-        
-        serializer = BlogPostCreateUpdateSerializer(data=data, context={'request': type('Request', (), {'user': self.user})()})
-        self.assertFalse(serializer.is_valid())
-        self.assertIn('title', serializer.errors)
-
-    def test_blog_post_create_update_serializer_content_too_short(self):
-        """Test that BlogPostCreateUpdateSerializer validates content length"""
-        data = {
-            'title': 'Valid Title',
-            'content': 'Short',  # Too short
-            'category': self.category.id
-        }
-        
-        serializer = BlogPostCreateUpdateSerializer(data=data, context={'request': type('Request', (), {'user': self.user})()})
-        self.assertFalse(serializer.is_valid())
-        self.assertIn('content', serializer.errors)
-
-    def test_blog_post_create_update_serializer_too_many_tags(self):
-        """Test that BlogPostCreateUpdateSerializer validates tag count"""
-        # Create many tags
-        tags = []
-        for i in range(11):
-            tag = Tag.objects.create(name=f'Tag{i}', slug=f'tag{i}')
-            tags.append(tag.id)
-        
-        data = {
-            'title': 'Valid Title',
-            'content': 'This is a blog post content that meets the minimum length requirement.',
-            'category': self.category.id,
-            'tags': tags  # Too many tags
-        }
-        
-        serializer = BlogPostCreateUpdateSerializer(data=data, context={'request': type('Request', (), {'user': self.user})()})
-        self.assertFalse(serializer.is_valid())
-        self.assertIn('tags', serializer.errors)
-
-    def test_blog_post_create_update_serializer_create(self):
-        data = {
-            'title': 'New Blog Post',
-            'content': 'This is a new blog post content that meets the minimum length requirement. '*3,
-            'excerpt': 'New blog post excerpt',
-            'category': self.category.id,
-            'tags': [self.tag.id],
-            'is_public': True,
-            'status': 'draft'
-        }
-        serializer = BlogPostCreateUpdateSerializer(data=data, context={'request': type('Request', (), {'user': self.user})()})
-        self.assertTrue(serializer.is_valid())
-        post = serializer.save()
-        self.assertEqual(post.title, 'New Blog Post')
-        self.assertEqual(post.author, self.user)
-        self.assertEqual(post.category, self.category)
-        self.assertEqual(list(post.tags.all()), [self.tag])
-
-    def test_blog_post_create_update_serializer_update(self):
-        data = {'title': 'Updated Blog Post', 'content': 'This is an updated blog post content that meets the minimum length requirement. '*3}
-        serializer = BlogPostCreateUpdateSerializer(self.post, data=data, partial=True, context={'request': type('Request', (), {'user': self.user})()})
-        self.assertTrue(serializer.is_valid())
-        updated_post = serializer.save()
-        self.assertEqual(updated_post.title, 'Updated Blog Post')
-        self.assertIn('meets the minimum', updated_post.content)
-
-    def test_blog_post_create_update_serializer_author_field(self):
-        data = {'title': 'New Blog Post', 'content': 'This is a new blog post content that meets the minimum length requirement. '*3, 'category': self.category.id}
-        serializer = BlogPostCreateUpdateSerializer(data=data, context={'request': type('Request', (), {'user': self.user})()})
-        self.assertTrue(serializer.is_valid())
-        post = serializer.save()
-        self.assertEqual(post.author, self.user)
-
-    def test_blog_post_create_update_serializer_with_featured_image(self):
-        # Create a temporary image file and wrap in SimpleUploadedFile
-        temp_image = tempfile.NamedTemporaryFile(suffix='.jpg', delete=False)
-        img = Image.new('RGB', (100, 100), color='red')
-        img.save(temp_image.name)
-        temp_image.close()
-        try:
-            with open(temp_image.name, 'rb') as f:
-                image_bytes = f.read()
-            uploaded = SimpleUploadedFile('test.jpg', image_bytes, content_type='image/jpeg')
-            data = {
-                'title': 'Blog Post with Image',
-                'content': 'This is a blog post content that meets the minimum length requirement. '*3,
-                'category': self.category.id,
-                'featured_image': uploaded
-            }
-            serializer = BlogPostCreateUpdateSerializer(data=data, context={'request': type('Request', (), {'user': self.user})()})
-            self.assertTrue(serializer.is_valid(), serializer.errors)
-            post = serializer.save()
-            self.assertEqual(post.title, 'Blog Post with Image')
-        finally:
-            if os.path.exists(temp_image.name):
-                os.unlink(temp_image.name)
 
+    assert data['title'] == 'Test Blog Post'
+    assert data['slug'] == 'test-blog-post'
+    assert data['excerpt'] == 'This is a test blog post content...'
+    assert data['author_name'] == 'Test User'
+    assert data['author_username'] == 'testuser'
+    assert data['category_name'] == 'Technology'
+    assert data['status'] == 'published'
+    assert data['is_public']
+    assert data['view_count'] == 0
+    assert data['like_count'] == 0
+    assert data['comments_count'] == 0
+
+
+def test_blog_post_list_serializer_uses_view_annotations(post, django_assert_num_queries):
+    """Test that a post loaded like the list views load it serializes without queries"""
+    post = with_list_counts(BlogPost.objects.select_related('author', 'category')).get(pk=post.pk)
+    with django_assert_num_queries(0):
+        data = BlogPostListSerializer(post).data
+    assert data['tags'][0]['posts_count'] == 1
+
+
+def test_blog_post_list_serializer_author_field(list_data):
+    """Test blog post list serializer author field"""
+    assert list_data['author_name'] == 'Test User'
+    assert list_data['author_username'] == 'testuser'
+
+
+def test_blog_post_list_serializer_category_field(list_data):
+    """Test blog post list serializer category field"""
+    assert list_data['category_name'] == 'Technology'
+
+
+def test_blog_post_list_serializer_tags_field(list_data):
+    """Test blog post list serializer tags field"""
+    tags_data = list_data['tags']
+    assert len(tags_data) == 1
+    assert tags_data[0]['name'] == 'Python'
+
+
+def test_blog_post_list_serializer_reading_time(list_data):
+    """Test that reading_time is computed correctly"""
+    # Content has about 15 words, so reading time should be 1 minute
+    assert list_data['reading_time'] == 1
+
+
+def test_blog_post_list_serializer_comments_count(list_data):
+    """Test that comments_count is computed correctly"""
+    assert list_data['comments_count'] == 0
+
+
+# BlogPostDetailSerializer
+
+@pytest.fixture(scope='module')
+def detail_data(blog_data, django_db_blocker):
+    """The shared post serialized once for the module's read-only checks"""
+    with django_db_blocker.unblock():
+        return BlogPostDetailSerializer(blog_data.post).data
+
+
+def test_blog_post_detail_serializer_fields(detail_data):
+    """Test that BlogPostDetailSerializer includes all fields"""
+    actual_fields = set(detail_data.keys())
+
+    expected_fields = {
+        'id', 'title', 'slug', 'content', 'excerpt', 'author',
+        'category', 'tags', 'is_public', 'status', 'meta_description',
+        'featured_image', 'publication_date', 'created_at', 'updated_at',
+        'view_count', 'like_count', 'comments_count', 'reading_time'
+    }
+
+    assert actual_fields == expected_fields
+
+
+def test_blog_post_detail_serializer_data(detail_data):
+    """Test that BlogPostDetailSerializer correctly serializes data"""
+    assert detail_data['title'] == 'Test Blog Post'
+    assert detail_data['slug'] == 'test-blog-post'
+    assert detail_data['content'] == 'This is a test blog post content that should be long enough to generate an excerpt.'
+    assert detail_data['excerpt'] == 'This is a test blog post content...'
+    assert detail_data['status'] == 'published'
+    assert detail_data['is_public']
+    assert detail_data['meta_description'] == 'Test meta description'
+    assert detail_data['view_count'] == 0
+    assert detail_data['like_count'] == 0
+    assert detail_data['comments_count'] == 0
+
+
+def test_blog_post_detail_serializer_author_field(detail_data):
+    """Test blog post detail serializer author field"""
+    author_data = detail_data['author']
+    assert author_data['username'] == 'testuser'
+    assert author_data['full_name'] == 'Test User'
+
+
+def test_blog_post_detail_serializer_category_field(detail_data):
+    """Test blog post detail serializer category field"""
+    category_data = detail_data['category']
+    assert category_data['name'] == 'Technology'
+    assert category_data['description'] == 'Technology related posts'
+
+
+def test_blog_post_detail_serializer_tags_field(post, django_assert_num_queries):
+    """Test blog post detail serializer tags field"""
+    serializer = BlogPostDetailSerializer(post)
+    # Unannotated post: the list serializer's queries plus the category's post count
+    with django_assert_num_queries(4):
+        tags_data = serializer.data['tags']
+    assert len(tags_data) == 1
+    assert tags_data[0]['name'] == 'Python'
+
+
+def test_blog_post_detail_serializer_matches_nested_serializers(post, category):
+    """Test that flat category and tags match CategorySerializer and TagSerializer"""
+    data = BlogPostDetailSerializer(post).data
+    assert data['category'] == CategorySerializer(category).data
+    assert data['tags'] == TagSerializer(post.tags.all(), many=True).data
+    assert BlogPostListSerializer(post).data['tags'] == data['tags']
+
+
+def test_blog_post_detail_serializer_builds_author_once(post, user, category):
+    """Test that the author dict is built once per author and context"""
+    other_post = BlogPost.objects.create(
+        title='Another Blog Post', content='Another post body. '*10,
+        author=user, category=category
+    )
+    posts = BlogPost.objects.select_related('author').filter(pk__in=[post.pk, other_post.pk])
+    data = BlogPostDetailSerializer(posts, many=True).data
+    assert data[0]['author'] is data[1]['author']
+    assert data[0]['author']['username'] == 'testuser'
+
+
+def test_blog_post_serializers_build_fields_once_per_class(post):
+    """Test that post serializer fields are cached per class but copied per instance"""
+    first = BlogPostListSerializer([post], many=True)
+    second = BlogPostListSerializer([post], many=True)
+    assert first.data == second.data
+
+    assert '_cached_fields' in BlogPostListSerializer.__dict__
+    assert first.child.fields['tags'] is not second.child.fields['tags']
+    assert second.child.fields['tags'].parent is second.child
+
+
+def test_blog_post_detail_serializer_read_only_fields(detail_data):
+    """Test that read-only fields are present but not modifiable"""
+    # These fields should be present
+    assert 'slug' in detail_data
+    assert 'view_count' in detail_data
+    assert 'like_count' in detail_data
+    assert 'created_at' in detail_data
+    assert 'updated_at' in detail_data
+
+
+# BlogPostCreateUpdateSerializer
+
+def test_blog_post_create_update_serializer_fields():
+    """Test that BlogPostCreateUpdateSerializer includes expected fields"""
+    serializer = BlogPostCreateUpdateSerializer()
+    actual_fields = set(serializer.fields.keys())
+
+    expected_fields = {
+        'title', 'content', 'excerpt', 'category', 'tags',
+        'is_public', 'status', 'meta_description', 'featured_image'
+    }
+
+    assert actual_fields == expected_fields
+
+
+@pytest.mark.parametrize('changes, error_field', [
+    ({}, None),
+    ({'title': MISSING}, 'title'),
+    ({'content': MISSING}, 'content'),
+    ({'title': 'Hi'}, 'title'),
+    ({'content': 'Short'}, 'content'),
+], ids=['valid', 'missing_title', 'missing_content', 'title_too_short', 'content_too_short'])
+def test_blog_post_create_update_serializer_validation(category, tag, request_ctx, changes, error_field):
+    """Test BlogPostCreateUpdateSerializer validation against a valid baseline"""
+    data = {
+        'title': 'New Blog Post',
+        'content': 'This is a new blog post content that meets the minimum length requirement. '*3,
+        'excerpt': 'New blog post excerpt',
+        'category': category.id,
+        'tags': [tag.id],
+        'is_public': True,
+        'status': 'draft'
+    }
+    data.update(changes)
+    data = {field: value for field, value in data.items() if value is not MISSING}
+
+    serializer = BlogPostCreateUpdateSerializer(data=data, context=request_ctx)
+    if error_field is None:
+        assert serializer.is_valid(), serializer.errors
+    else:
+        assert not serializer.is_valid()
+        assert set(serializer.errors) == {error_field}
+
+def test_blog_post_create_update_serializer_tags_single_query(tag, request_ctx, django_assert_num_queries):
+    """Test that submitted tag ids are looked up with one query"""
+    tags = [tag] + [Tag.objects.create(name=f'Tag {i}') for i in range(4)]
+    data = {
+        'title': 'New Blog Post',
+        'content': 'This is a new blog post content that meets the minimum length requirement. '*3,
+        'tags': [tag.id for tag in reversed(tags)],
+    }
+    serializer = BlogPostCreateUpdateSerializer(data=data, context=request_ctx)
+    with django_assert_num_queries(1):
+        assert serializer.is_valid(), serializer.errors
+    assert serializer.validated_data['tags'] == list(reversed(tags))
+
+    for invalid in ([999999], ['abc'], [True], 'abc'):
+        data['tags'] = invalid
+        serializer = BlogPostCreateUpdateSerializer(data=data, context=request_ctx)
+        assert not serializer.is_valid()
+        assert 'tags' in serializer.errors
+
+
+def test_blog_post_create_update_serializer_create_links_tags_in_one_insert(tag, request_ctx):
+    """Test that creating a post links its tags with a single INSERT"""
+    tags = [tag] + [Tag.objects.create(name=f'Tag {i}') for i in range(4)]
+    data = {
+        'title': 'New Blog Post',
+        'content': 'This is a new blog post content that meets the minimum length requirement. '*3,
+        'tags': [tag.id for tag in tags] + [tag.id],
+    }
+    serializer = BlogPostCreateUpdateSerializer(data=data, context=request_ctx)
+    assert serializer.is_valid(), serializer.errors
+    with CaptureQueriesContext(connection) as queries:
+        post = serializer.save()
+    assert len([q for q in queries if 'blog_blogpost_tags' in q['sql']]) == 1
+    assert set(post.tags.all()) == set(tags)
+
+
+def test_blog_post_create_update_serializer_create_drops_list_version_after_tags(tag, request_ctx):
+    """Test that a list cached before a new post's tags are linked goes stale"""
+    def list_request(sender, **kwargs):
+        # A list rendered between the post's INSERT and its tags' INSERT
+        post_list_version()
+
+    data = {
+        'title': 'New Blog Post',
+        'content': 'This is a new blog post content that meets the minimum length requirement. '*3,
+        'tags': [tag.id],
+    }
+    serializer = BlogPostCreateUpdateSerializer(data=data, context=request_ctx)
+    assert serializer.is_valid(), serializer.errors
+    post_save.connect(list_request, sender=BlogPost)
+    try:
+        serializer.save()
+    finally:
+        post_save.disconnect(list_request, sender=BlogPost)
+    assert cache.get(POST_LIST_VERSION_KEY) is None
+
+
+def test_blog_post_create_update_serializer_title_length_ignores_whitespace(request_ctx):
+    """Test that the title length is checked after trimming whitespace"""
+    data = {
+        'title': '   Hi   ',
+        'content': 'This is a blog post content that meets the minimum length requirement. '*3,
+    }
+
+    serializer = BlogPostCreateUpdateSerializer(data=data, context=request_ctx)
+    assert not serializer.is_valid()
+    assert serializer.errors['title'] == ["Title must be at least 5 characters long."]
+
+    data['title'] = '  Valid Title  '
+    serializer = BlogPostCreateUpdateSerializer(data=data, context=request_ctx)
+    assert serializer.is_valid(), serializer.errors
+    assert serializer.validated_data['title'] == 'Valid Title'
+
+
+def test_blog_post_create_update_serializer_too_many_tags(category, request_ctx):
+    """Test that BlogPostCreateUpdateSerializer validates tag count"""
+    # Create many tags
+    tags = [tag.id for tag in Tag.objects.bulk_create(
+        TagFactory.build_batch(11, name=factory.Iterator([f'Tag{i}' for i in range(11)]))
+    )]
+
+    data = {
+        'title': 'Valid Title',
+        'content': 'This is a blog post content that meets the minimum length requirement.',
+        'category': category.id,
+        'tags': tags  # Too many tags
+    }
+
+    serializer = BlogPostCreateUpdateSerializer(data=data, context=request_ctx)
+    assert not serializer.is_valid()
+    assert 'tags' in serializer.errors
+
+
+def test_blog_post_create_update_serializer_create(user, category, tag, request_ctx):
+    data = {
+        'title': 'New Blog Post',
+        'content': 'This is a new blog post content that meets the minimum length requirement. '*3,
+        'excerpt': 'New blog post excerpt',
+        'category': category.id,
+        'tags': [tag.id],
+        'is_public': True,
+        'status': 'draft'
+    }
+    serializer = BlogPostCreateUpdateSerializer(data=data, context=request_ctx)
+    assert serializer.is_valid()
+    post = serializer.save()
+    assert post.title == 'New Blog Post'
+    assert post.author == user
+    assert post.category == category
+    assert list(post.tags.all()) == [tag]
+
+
+def test_blog_post_create_update_serializer_update(post, request_ctx):
+    data = {'title': 'Updated Blog Post', 'content': 'This is an updated blog post content that meets the minimum length requirement. '*3}
+    serializer = BlogPostCreateUpdateSerializer(post, data=data, partial=True, context=request_ctx)
+    assert serializer.is_valid()
+    updated_post = serializer.save()
+    assert updated_post.title == 'Updated Blog Post'
+    assert 'meets the minimum' in updated_post.content
+
+
+def test_blog_post_create_update_serializer_author_field(user, category, request_ctx):
+    data = {'title': 'New Blog Post', 'content': 'This is a new blog post content that meets the minimum length requirement. '*3, 'category': category.id}
+    serializer = BlogPostCreateUpdateSerializer(data=data, context=request_ctx)
+    assert serializer.is_valid()
+    post = serializer.save()
+    assert post.author == user
+
+
+def test_blog_post_create_update_serializer_with_featured_image(category, request_ctx):
+    uploaded = SimpleUploadedFile('test.jpg', _MIN_JPEG, content_type='image/jpeg')
+    data = {
+        'title': 'Blog Post with Image',
+        'content': 'This is a blog post content that meets the minimum length requirement. '*3,
+        'category': category.id,
+        'featured_image': uploaded
+    }
+    serializer = BlogPostCreateUpdateSerializer(data=data, context=request_ctx)
+    assert serializer.is_valid(), serializer.errors
+    post = serializer.save()
+    assert post.title == 'Blog Post with Image'
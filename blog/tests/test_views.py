@@ -1,10 +1,15 @@
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
 from django.urls import reverse
-from rest_framework.test import APITestCase, APIClient
+from django.utils import timezone
+from rest_framework.test import APITestCase
 from rest_framework import status
-from rest_framework_simplejwt.tokens import RefreshToken
-from ..models import Category, Tag, BlogPost
+from authentication.testing import JWTAuthMixin
+from comments.models import Comment
+from ..models import Category, Tag, BlogPost, Like
 from ..serializers import (
 	BlogPostListSerializer,
 	BlogPostDetailSerializer,
@@ -12,51 +17,54 @@ from ..serializers import (
 	CategorySerializer,
 	TagSerializer
 )
+from datetime import timedelta
 import tempfile
 import os
 from PIL import Image
 
 User = get_user_model()
 
-class BlogViewsTest(APITestCase):
-	def setUp(self):
-		"""Set up test data"""
-		self.client = APIClient()
-		self.user = User.objects.create_user(email='test@example.com', username='testuser', password='testpass123')
-		self.admin_user = User.objects.create_superuser(email='admin@example.com', username='adminuser', password='adminpass123')
-		self.other_user = User.objects.create_user(email='other@example.com', username='otheruser', password='otherpass123')
-		self.category = Category.objects.create(name='Technology', description='Technology related posts')
-		self.category2 = Category.objects.create(name='Science', description='Science related posts')
-		self.tag = Tag.objects.create(name='Python')
-		self.tag2 = Tag.objects.create(name='Django')
-		self.published_post = BlogPost.objects.create(
+@override_settings(NPLUSONE_RAISE=True)
+class BlogViewsTest(JWTAuthMixin, APITestCase):
+	@classmethod
+	def setUpTestData(cls):
+		"""Set up test data once for the whole class"""
+		cls.user = User.objects.create_user(email='test@example.com', username='testuser', password='testpass123')
+		cls.admin_user = User.objects.create_superuser(email='admin@example.com', username='adminuser', password='adminpass123')
+		cls.other_user = User.objects.create_user(email='other@example.com', username='otheruser', password='otherpass123')
+		cls.category = Category.objects.create(name='Technology', description='Technology related posts')
+		cls.category2 = Category.objects.create(name='Science', description='Science related posts')
+		cls.tag = Tag.objects.create(name='Python')
+		cls.tag2 = Tag.objects.create(name='Django')
+		cls.published_post = BlogPost.objects.create(
 			title='Published Post', content='This is a published post content that is sufficiently long to satisfy validations. '*3,
-			excerpt='Published excerpt', author=self.user, category=self.category,
+			excerpt='Published excerpt', author=cls.user, category=cls.category,
 			is_public=True, status=BlogPost.PUBLISHED, meta_description='Published meta description',
 		)
-		self.published_post.tags.add(self.tag)
-		self.draft_post = BlogPost.objects.create(
+		cls.published_post.tags.add(cls.tag)
+		cls.draft_post = BlogPost.objects.create(
 			title='Draft Post', content='This is a draft post content that is also long enough to be valid. '*3,
-			excerpt='Draft excerpt', author=self.user, category=self.category,
+			excerpt='Draft excerpt', author=cls.user, category=cls.category,
 			is_public=False, status=BlogPost.DRAFT, meta_description='Draft meta description',
 		)
-		self.other_user_post = BlogPost.objects.create(
+		cls.other_user_post = BlogPost.objects.create(
 			title='Other User Post', content='Other user post content that is long enough. '*3,
-			excerpt='Other user excerpt', author=self.other_user, category=self.category2,
+			excerpt='Other user excerpt', author=cls.other_user, category=cls.category2,
 			is_public=True, status=BlogPost.PUBLISHED, meta_description='Other user meta description',
 		)
 		# Correct router names
-		self.category_list_url = reverse('blog:categories-list')
-		self.category_detail_url = reverse('blog:categories-detail', kwargs={'pk': self.category.pk})
-		self.tag_list_url = reverse('blog:tags-list')
-		self.tag_detail_url = reverse('blog:tags-detail', kwargs={'pk': self.tag.pk})
-		self.post_list_url = reverse('blog:posts-list')
-		self.post_detail_url = reverse('blog:posts-detail', kwargs={'pk': self.published_post.pk})
-		self.draft_post_detail_url = reverse('blog:posts-detail', kwargs={'pk': self.draft_post.pk})
-
-	def get_auth_headers(self, user):
-		refresh = RefreshToken.for_user(user)
-		return {'HTTP_AUTHORIZATION': f'Bearer {refresh.access_token}'}
+		cls.category_list_url = reverse('blog:categories-list')
+		cls.category_detail_url = reverse('blog:categories-detail', kwargs={'pk': cls.category.pk})
+		cls.tag_list_url = reverse('blog:tags-list')
+		cls.tag_detail_url = reverse('blog:tags-detail', kwargs={'pk': cls.tag.pk})
+		cls.post_list_url = reverse('blog:posts-list')
+		cls.post_detail_url = reverse('blog:posts-detail', kwargs={'pk': cls.published_post.pk})
+		cls.draft_post_detail_url = reverse('blog:posts-detail', kwargs={'pk': cls.draft_post.pk})
+
+	def setUp(self):
+		# Cached list responses would otherwise outlive the rows each test rolls back
+		cache.clear()
+		caches['post_views'].clear()
 
 	def _extract_results(self, response):
 		return response.data['results'] if isinstance(response.data, dict) and 'results' in response.data else response.data
@@ -138,13 +146,27 @@ class BlogViewsTest(APITestCase):
 
 	def test_blog_post_list_view_authenticated(self):
 		self.client.credentials(**self.get_auth_headers(self.user))
-		response = self.client.get(self.post_list_url)
+		# The token's user, the page count, the posts and their tags
+		with self.assertNumQueries(4):
+			response = self.client.get(self.post_list_url)
 		self.assertEqual(response.status_code, status.HTTP_200_OK)
 		items = self._extract_results(response)
 		titles = [p['title'] for p in items]
 		self.assertIn('Published Post', titles)
 		self.assertIn('Draft Post', titles)
 		self.assertIn('Other User Post', titles)
+		
+		BlogPost.objects.bulk_create([
+			BlogPost(
+				title=f'Bulk Post {i}', slug=f'bulk-post-{i}', content='Bulk post content. '*10,
+				author=self.other_user, category=self.category2, is_public=True, status=BlogPost.PUBLISHED,
+			)
+			for i in range(20)
+		])
+		cache.clear()  # bulk_create sends no signals to drop the cached page
+		with self.assertNumQueries(4):
+			response = self.client.get(self.post_list_url)
+		self.assertEqual(response.data['count'], 23)
 
 	def test_blog_post_list_view_unauthenticated(self):
 		self.assertEqual(self.client.get(self.post_list_url).status_code, status.HTTP_401_UNAUTHORIZED)
@@ -160,6 +182,8 @@ class BlogViewsTest(APITestCase):
 		self.client.credentials(**self.get_auth_headers(self.user))
 		self.assertEqual(self.client.get(self.draft_post_detail_url).status_code, status.HTTP_200_OK)
 
+	# A denied retrieve never renders the author it selected
+	@override_settings(NPLUSONE_RAISE=False)
 	def test_blog_post_detail_view_other_user_draft_forbidden(self):
 		other_draft = BlogPost.objects.create(title='Other Draft', content='Other draft content that is long enough. '*3, author=self.other_user, status=BlogPost.DRAFT, is_public=False)
 		self.client.credentials(**self.get_auth_headers(self.user))
@@ -195,6 +219,14 @@ class BlogViewsTest(APITestCase):
 		self.assertEqual(resp.data['title'], update_data['title'])
 		self.assertEqual(resp.data['content'].strip(), update_data['content'].strip())
 
+	def test_blog_post_update_view_duplicate_title(self):
+		self.client.credentials(**self.get_auth_headers(self.user))
+		resp = self.client.patch(self.post_detail_url, {'title': self.draft_post.title})
+		self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+		self.assertIn('title', resp.data)
+		self.published_post.refresh_from_db()
+		self.assertEqual(self.published_post.title, 'Published Post')
+
 	def test_blog_post_update_view_non_author_forbidden(self):
 		self.client.credentials(**self.get_auth_headers(self.other_user))
 		self.assertEqual(self.client.patch(self.post_detail_url, {'title': 'Unauthorized Update'}).status_code, status.HTTP_403_FORBIDDEN)
@@ -213,11 +245,179 @@ class BlogViewsTest(APITestCase):
 		self.assertEqual(self.client.get(f"{self.post_list_url}?status={BlogPost.PUBLISHED}").status_code, status.HTTP_200_OK)
 		self.assertEqual(self.client.get(f"{self.post_list_url}?author={self.user.id}").status_code, status.HTTP_200_OK)
 
+	def test_blog_post_filter_by_category_and_tags(self):
+		self.client.credentials(**self.get_auth_headers(self.user))
+		resp = self.client.get(f"{self.post_list_url}?category={self.category.id}&tags={self.tag.id}")
+		self.assertEqual(resp.status_code, status.HTTP_200_OK)
+		self.assertIn('Published Post', [p['title'] for p in self._extract_results(resp)])
+		# Unknown ids are still rejected
+		self.assertEqual(self.client.get(f"{self.post_list_url}?category=999999").status_code, status.HTTP_400_BAD_REQUEST)
+		self.assertEqual(self.client.get(f"{self.post_list_url}?tags=999999").status_code, status.HTTP_400_BAD_REQUEST)
+
+	def test_blog_post_filter_choices_cached(self):
+		self.client.credentials(**self.get_auth_headers(self.user))
+		url = f"{self.post_list_url}?category={self.category.id}"
+		self.client.get(url)
+		with CaptureQueriesContext(connection) as queries:
+			self.client.get(url)
+		self.assertFalse([q for q in queries if 'FROM "blog_category"' in q['sql'] and 'JOIN' not in q['sql']])
+		# A new category is accepted right away
+		category = Category.objects.create(name='Fresh')
+		self.assertEqual(self.client.get(f"{self.post_list_url}?category={category.id}").status_code, status.HTTP_200_OK)
+
+	def _create_extra_posts(self, author, count=5):
+		posts = BlogPost.objects.bulk_create([
+			BlogPost(
+				title=f'Extra Post {i}', slug=f'extra-post-{i}', content='Extra post content. '*10, author=author,
+				category=self.category2, is_public=True, status=BlogPost.PUBLISHED,
+			)
+			for i in range(count)
+		])
+		BlogPost.tags.through.objects.bulk_create([
+			BlogPost.tags.through(blogpost=post, tag=tag) for post in posts for tag in (self.tag, self.tag2)
+		])
+		Comment.objects.bulk_create([Comment(post=post, author=self.user, content='Nice post') for post in posts])
+		cache.clear()  # bulk_create sends no signals to drop cached lists
+
+	def test_blog_post_list_query_count_is_constant(self):
+		self.client.credentials(**self.get_auth_headers(self.user))
+		with CaptureQueriesContext(connection) as before:
+			self.client.get(self.post_list_url)
+		self._create_extra_posts(self.other_user)
+		with CaptureQueriesContext(connection) as after:
+			resp = self.client.get(self.post_list_url)
+		self.assertEqual(len(after), len(before))
+		counts = {p['title']: p['comments_count'] for p in self._extract_results(resp)}
+		self.assertEqual(counts['Extra Post 0'], 1)
+
+	def test_blog_post_list_conditional_get(self):
+		self.client.credentials(**self.get_auth_headers(self.user))
+		resp = self.client.get(self.post_list_url)
+		self.assertEqual(resp.status_code, status.HTTP_200_OK)
+		etag = resp['ETag']
+		# Hashed, so it doesn't expose the user or the URL
+		self.assertNotIn(self.post_list_url, etag)
+		self.assertFalse(resp.has_header('Last-Modified'))
+		with self.assertNumQueries(1):  # the token's user
+			self.assertEqual(self.client.get(self.post_list_url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+		with self.assertNumQueries(1):  # served from the cached body
+			self.assertEqual(self.client.get(self.post_list_url).data, resp.data)
+		Comment.objects.create(post=self.published_post, author=self.other_user, content='Nice post')
+		resp = self.client.get(self.post_list_url, HTTP_IF_NONE_MATCH=etag)
+		self.assertEqual(resp.status_code, status.HTTP_200_OK)
+		self.assertNotEqual(resp['ETag'], etag)
+
+	def test_blog_post_detail_conditional_get(self):
+		self.client.credentials(**self.get_auth_headers(self.other_user))
+		resp = self.client.get(self.post_detail_url)
+		self.assertEqual(resp.status_code, status.HTTP_200_OK)
+		etag = resp['ETag']
+		self.assertFalse(resp.has_header('Last-Modified'))
+		with self.assertNumQueries(2):  # the token's user and updated_at
+			self.assertEqual(self.client.get(self.post_detail_url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+		Comment.objects.create(post=self.published_post, author=self.other_user, content='Nice post')
+		resp = self.client.get(self.post_detail_url, HTTP_IF_NONE_MATCH=etag)
+		self.assertEqual(resp.status_code, status.HTTP_200_OK)
+		self.assertEqual(resp.data['comments_count'], 1)
+		# Posts the user can't view are refused, not revalidated (a denied
+		# retrieve never renders the author it selected)
+		with self.settings(NPLUSONE_RAISE=False):
+			resp = self.client.get(self.draft_post_detail_url, HTTP_IF_NONE_MATCH='*')
+		self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
+
+	def test_blog_post_list_cache_is_per_user(self):
+		self.client.credentials(**self.get_auth_headers(self.user))
+		self.assertIn('Draft Post', [p['title'] for p in self._extract_results(self.client.get(self.post_list_url))])
+		self.client.credentials(**self.get_auth_headers(self.other_user))
+		self.assertNotIn('Draft Post', [p['title'] for p in self._extract_results(self.client.get(self.post_list_url))])
+
+	def test_blog_post_list_skips_content(self):
+		self.client.credentials(**self.get_auth_headers(self.user))
+		for url in (self.post_list_url, reverse('blog:posts-my-posts'), reverse('blog:posts-public-posts'), reverse('blog:posts-popular')):
+			with CaptureQueriesContext(connection) as queries:
+				self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+			for field in ('content', 'meta_description'):
+				self.assertFalse([q for q in queries if '"blog_blogpost"."%s"' % field in q['sql']], url)
+
+	def test_blog_post_actions_query_count_is_constant(self):
+		self.client.credentials(**self.get_auth_headers(self.user))
+		urls = [reverse('blog:posts-my-posts'), reverse('blog:posts-public-posts'), reverse('blog:posts-popular')]
+		before = {}
+		for url in urls:
+			with CaptureQueriesContext(connection) as queries:
+				self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+			before[url] = len(queries)
+		self._create_extra_posts(self.user)
+		for url in urls:
+			with CaptureQueriesContext(connection) as queries:
+				self.client.get(url)
+			self.assertEqual(len(queries), before[url], url)
+
+	def test_blog_post_popular_ordering(self):
+		BlogPost.objects.filter(pk=self.published_post.pk).update(view_count=3, like_count=1, popularity=4)
+		BlogPost.objects.filter(pk=self.other_user_post.pk).update(view_count=1, like_count=5, popularity=6)
+		self.client.credentials(**self.get_auth_headers(self.user))
+		resp = self.client.get(reverse('blog:posts-popular'))
+		self.assertEqual(resp.status_code, status.HTTP_200_OK)
+		self.assertEqual([p['title'] for p in resp.data], ['Other User Post', 'Published Post'])
+
+	def test_blog_post_popular_cached(self):
+		url = reverse('blog:posts-popular')
+		self.client.credentials(**self.get_auth_headers(self.user))
+		resp = self.client.get(url)
+		self.client.credentials(**self.get_auth_headers(self.other_user))
+		with self.assertNumQueries(1):  # the token's user
+			self.assertEqual(self.client.get(url).data, resp.data)
+		BlogPost.objects.create(
+			title='New Post', content='New post content. '*10, author=self.other_user,
+			category=self.category, is_public=True, status=BlogPost.PUBLISHED,
+		)
+		self.assertIn('New Post', [p['title'] for p in self.client.get(url).data])
+
+	def test_blog_post_list_mine_matches_my_posts(self):
+		self.client.credentials(**self.get_auth_headers(self.user))
+		mine = self._extract_results(self.client.get(self.post_list_url, {'mine': 'true'}))
+		self.assertEqual({p['title'] for p in mine}, {'Published Post', 'Draft Post'})
+		legacy = self._extract_results(self.client.get(reverse('blog:posts-my-posts')))
+		self.assertEqual(legacy, mine)
+		drafts = self._extract_results(self.client.get(reverse('blog:posts-my-posts'), {'status': 'draft'}))
+		self.assertEqual([p['title'] for p in drafts], ['Draft Post'])
+		others = self._extract_results(self.client.get(self.post_list_url, {'mine': 'false'}))
+		self.assertEqual([p['title'] for p in others], ['Other User Post'])
+
+	def test_blog_post_list_public_matches_public_posts(self):
+		self.client.credentials(**self.get_auth_headers(self.user))
+		public = self._extract_results(self.client.get(self.post_list_url, {'is_public': 'true', 'status': 'published'}))
+		self.assertEqual({p['title'] for p in public}, {'Published Post', 'Other User Post'})
+		self.assertEqual(self._extract_results(self.client.get(reverse('blog:posts-public-posts'))), public)
+
 	def test_blog_post_search(self):
 		self.client.credentials(**self.get_auth_headers(self.user))
 		self.assertEqual(self.client.get(f"{self.post_list_url}?search=Published").status_code, status.HTTP_200_OK)
 		self.assertEqual(self.client.get(f"{self.post_list_url}?search=content").status_code, status.HTTP_200_OK)
 
+	def test_blog_post_filter_by_tag_names(self):
+		self.published_post.tags.add(self.tag2)
+		self.client.credentials(**self.get_auth_headers(self.user))
+		resp = self.client.get(f"{self.post_list_url}?tag_names=Python, Django")
+		self.assertEqual(resp.status_code, status.HTTP_200_OK)
+		titles = [p['title'] for p in self._extract_results(resp)]
+		# Matching several tags must not duplicate the post
+		self.assertEqual(titles, ['Published Post'])
+
+	def test_blog_post_filter_by_publication_date(self):
+		self.client.credentials(**self.get_auth_headers(self.user))
+		today = timezone.localdate(self.published_post.publication_date)
+		yesterday = today - timedelta(days=1)
+		# date_to covers the whole day, not just its first instant
+		resp = self.client.get(f"{self.post_list_url}?date_from={today}&date_to={today}")
+		self.assertEqual(resp.status_code, status.HTTP_200_OK)
+		self.assertIn('Published Post', [p['title'] for p in self._extract_results(resp)])
+		resp = self.client.get(f"{self.post_list_url}?date_to={yesterday}")
+		self.assertNotIn('Published Post', [p['title'] for p in self._extract_results(resp)])
+		resp = self.client.get(f"{self.post_list_url}?date_from={today + timedelta(days=1)}")
+		self.assertNotIn('Published Post', [p['title'] for p in self._extract_results(resp)])
+
 	def test_blog_post_ordering(self):
 		self.client.credentials(**self.get_auth_headers(self.user))
 		self.assertEqual(self.client.get(self.post_list_url).status_code, status.HTTP_200_OK)
@@ -226,9 +426,50 @@ class BlogViewsTest(APITestCase):
 	def test_blog_post_view_count_increment(self):
 		self.client.credentials(**self.get_auth_headers(self.user))
 		initial = self.published_post.view_count
-		self.assertEqual(self.client.get(self.post_detail_url).status_code, status.HTTP_200_OK)
+		with CaptureQueriesContext(connection) as queries:
+			resp = self.client.get(self.post_detail_url)
+		self.assertEqual(resp.status_code, status.HTTP_200_OK)
+		self.assertEqual(resp.data['view_count'], initial + 1)
+		# One atomic UPDATE of the counter alone, not a save() of the whole row
+		updates = [q['sql'] for q in queries if q['sql'].startswith('UPDATE "blog_blogpost"')]
+		self.assertEqual(len(updates), 1)
+		self.assertIn('"view_count" = ("blog_blogpost"."view_count" + 1)', updates[0])
 		self.published_post.refresh_from_db()
 		self.assertEqual(self.published_post.view_count, initial + 1)
+		# Repeat views by the same user don't count, with or without a session,
+		# and culling the default cache doesn't forget them
+		self.client.get(self.post_detail_url)
+		self.client.cookies.clear()
+		cache.clear()
+		self.client.get(self.post_detail_url)
+		self.published_post.refresh_from_db()
+		self.assertEqual(self.published_post.view_count, initial + 1)
+		# Another user's view does
+		self.client.credentials(**self.get_auth_headers(self.other_user))
+		self.assertEqual(self.client.get(self.post_detail_url).data['view_count'], initial + 2)
+
+	def test_blog_post_like_toggle(self):
+		url = reverse('blog:posts-like', kwargs={'pk': self.published_post.pk})
+		self.client.credentials(**self.get_auth_headers(self.other_user))
+		resp = self.client.post(url)
+		self.assertEqual(resp.status_code, status.HTTP_200_OK)
+		self.assertEqual(resp.data, {'action': 'liked', 'like_count': 1})
+		self.assertTrue(Like.objects.filter(user=self.other_user, post=self.published_post).exists())
+		# A like belongs to the user, not the session
+		self.client.cookies.clear()
+		self.assertEqual(self.client.post(url).data, {'action': 'unliked', 'like_count': 0})
+		self.assertFalse(Like.objects.filter(post=self.published_post).exists())
+		self.published_post.refresh_from_db()
+		self.assertEqual(self.published_post.like_count, 0)
+
+	def test_blog_post_update_tags(self):
+		self.client.credentials(**self.get_auth_headers(self.user))
+		resp = self.client.patch(self.post_detail_url, {'tags': [self.tag2.pk]}, format='json')
+		self.assertEqual(resp.status_code, status.HTTP_200_OK)
+		# Not the tags prefetched when the post was looked up
+		self.assertEqual(resp.data['tags'], [self.tag2.pk])
+		resp = self.client.get(self.post_detail_url)
+		self.assertEqual([t['name'] for t in resp.data['tags']], ['Django'])
 
 	def test_blog_post_methods(self):
 		self.client.credentials(**self.get_auth_headers(self.user))
@@ -1,12 +1,16 @@
 # ===== blog/views.py =====
-from rest_framework import viewsets, generics, status, permissions
+from rest_framework import viewsets, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.throttling import UserRateThrottle, ScopedRateThrottle
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q, Count
-from django.shortcuts import get_object_or_404
-from .models import BlogPost, Category, Tag
+from drf_spectacular.utils import extend_schema
+from django.core.cache import cache, caches
+from django.db import transaction
+from django.db.models import Count, Prefetch, Q
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+from .models import BlogPost, Category, Tag, Like
 from .serializers import (
     BlogPostListSerializer,
     BlogPostDetailSerializer,
@@ -16,12 +20,81 @@ from .serializers import (
 )
 from .permissions import IsAuthorOrReadOnly, CanViewPost
 from .filters import BlogPostFilter
+from .cache import (
+    POST_LIST_TIMEOUT,
+    POPULAR_POSTS_KEY_FORMAT,
+    post_list_version,
+    post_list_key,
+    post_list_etag
+)
+
+# Post list serializers never read the body or the SEO description; reading
+# time comes from word_count
+LIST_DEFERRED_FIELDS = ('content', 'meta_description')
+
+# Actions serving the post list; my_posts and public_posts are the list
+# with ?mine=true and ?is_public=true&status=published
+LIST_ACTIONS = ('list', 'my_posts', 'public_posts')
+
+# How long a user's repeat views of a post aren't counted; the keys are kept
+# in the 'post_views' cache so list pages can't push them out
+POST_VIEWED_TIMEOUT = 60 * 60 * 24
+POST_VIEWED_KEY_FORMAT = 'post_viewed:%s:%s'
+
+def post_version(request, pk=None, *args, **kwargs):
+    """
+    When a post the user may view last changed, or None to let retrieve()
+    answer with its 403 or 404. Counts change without touching updated_at,
+    so the post list version counts too.
+    """
+    if not hasattr(request, '_post_version'):
+        try:
+            updated_at = BlogPost.objects.viewable_by(request.user).filter(
+                pk=pk
+            ).values_list('updated_at', flat=True).first()
+        except (TypeError, ValueError):
+            updated_at = None
+        request._post_version = updated_at and max(updated_at, post_list_version())
+    return request._post_version
+
+def post_etag(request, *args, **kwargs):
+    version = post_version(request, *args, **kwargs)
+    return version and str(version.timestamp())
+
+def posts_count():
+    """Published, public posts per category or tag, for _posts_count"""
+    return Count(
+        'posts',
+        filter=Q(posts__status='published', posts__is_public=True),
+        distinct=True
+    )
+
+def tags_prefetch():
+    """
+    Prefetch a post's tags together with their post counts, as a plain list
+    in prefetched_tags
+    """
+    return Prefetch(
+        'tags',
+        queryset=Tag.objects.annotate(_posts_count=posts_count()).order_by(*Tag._meta.ordering),
+        to_attr='prefetched_tags'
+    )
+
+def with_list_counts(posts):
+    """
+    Annotate approved comment counts and prefetch tags with their post
+    counts, so the post serializers don't run a COUNT per post and per tag
+    """
+    # Aggregation drops Meta.ordering, so it's restored explicitly
+    return posts.annotate(
+        _comments_count=Count('comments', filter=Q(comments__is_approved=True), distinct=True)
+    ).order_by(*BlogPost._meta.ordering).prefetch_related(tags_prefetch())
 
 class CategoryViewSet(viewsets.ModelViewSet):
     """
     ViewSet for managing categories
     """
-    queryset = Category.objects.all()
+    queryset = Category.objects.annotate(_posts_count=posts_count()).order_by(*Category._meta.ordering)
     serializer_class = CategorySerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
@@ -41,7 +114,7 @@ class TagViewSet(viewsets.ModelViewSet):
     """
     ViewSet for managing tags
     """
-    queryset = Tag.objects.all()
+    queryset = Tag.objects.annotate(_posts_count=posts_count()).order_by(*Tag._meta.ordering)
     serializer_class = TagSerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
@@ -80,23 +153,25 @@ class BlogPostViewSet(viewsets.ModelViewSet):
         """
         user = self.request.user
         
-        if self.action == 'list':
+        if self.action in LIST_ACTIONS:
             # For list view, show public published posts + user's own posts
-            return BlogPost.objects.filter(
-                Q(is_public=True, status='published') |
-                Q(author=user)
-            ).select_related('author', 'category').prefetch_related('tags')
-        else:
+            return with_list_counts(BlogPost.objects.viewable_by(user).select_related(
+                'author', 'category'
+            ).defer(*LIST_DEFERRED_FIELDS))
+        elif self.action == 'retrieve':
             # For detail views, use object-level permissions
-            return BlogPost.objects.all().select_related(
+            return with_list_counts(BlogPost.objects.select_related(
                 'author', 'category'
-            ).prefetch_related('tags')
+            ))
+        else:
+            # Writes and likes don't render the post's relations or counts
+            return BlogPost.objects.all()
     
     def get_serializer_class(self):
         """
         Return different serializers based on action
         """
-        if self.action == 'list':
+        if self.action in LIST_ACTIONS:
             return BlogPostListSerializer
         elif self.action in ['create', 'update', 'partial_update']:
             return BlogPostCreateUpdateSerializer
@@ -121,62 +196,75 @@ class BlogPostViewSet(viewsets.ModelViewSet):
             return [PostCreateThrottle()]
         return [UserRateThrottle()]
     
+    # No Last-Modified: it has whole-second resolution, so a change in the
+    # second a version started would still get a 304
+    @method_decorator(condition(etag_func=post_list_etag))
+    def list(self, request, *args, **kwargs):
+        """
+        List posts, reusing the rendered page until the list version changes;
+        clients revalidating with the ETag get a 304
+        """
+        key = post_list_key(request)
+        data = cache.get(key)
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            cache.set(key, data, POST_LIST_TIMEOUT)
+        return Response(data)
+    
+    # ETag only, as for list()
+    @method_decorator(condition(etag_func=post_etag))
     def retrieve(self, request, *args, **kwargs):
         """
-        Retrieve a post and increment view count
+        Retrieve a post and increment view count; clients revalidating with
+        the ETag get a 304, which isn't counted as a view
         """
         instance = self.get_object()
         
-        # Increment view count (only once per user per session)
-        session_key = f'viewed_post_{instance.id}'
-        if not request.session.get(session_key, False):
-            instance.increment_view_count()
-            request.session[session_key] = True
+        # Increment view count (only once per user a day); a cache entry
+        # rather than a session key, so viewing doesn't write a session
+        viewed_key = POST_VIEWED_KEY_FORMAT % (request.user.pk, instance.pk)
+        if caches['post_views'].add(viewed_key, True, POST_VIEWED_TIMEOUT):
+            instance.record_view()
         
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
     
+    @extend_schema(deprecated=True, description="Use the post list with ?mine=true.")
     @action(detail=False, methods=['get'])
     def my_posts(self, request):
         """
         Get current user's posts
         """
-        posts = BlogPost.objects.filter(
-            author=request.user
-        ).select_related('category').prefetch_related('tags')
+        posts = self.get_queryset().filter(author=request.user)
         
-        # Apply filtering
-        filterset = BlogPostFilter(request.GET, queryset=posts)
-        posts = filterset.qs
+        # Apply filtering through the viewset's filter backends
+        posts = self.filter_queryset(posts)
         
         page = self.paginate_queryset(posts)
         if page is not None:
-            serializer = BlogPostListSerializer(page, many=True, context={'request': request})
+            serializer = self.get_serializer(page, many=True)
             return self.get_paginated_response(serializer.data)
         
-        serializer = BlogPostListSerializer(posts, many=True, context={'request': request})
+        serializer = self.get_serializer(posts, many=True)
         return Response(serializer.data)
     
+    @extend_schema(deprecated=True, description="Use the post list with ?is_public=true&status=published.")
     @action(detail=False, methods=['get'])
     def public_posts(self, request):
         """
         Get all public published posts
         """
-        posts = BlogPost.objects.filter(
-            is_public=True,
-            status='published'
-        ).select_related('author', 'category').prefetch_related('tags')
+        posts = self.get_queryset().filter(is_public=True, status=BlogPost.PUBLISHED)
         
-        # Apply filtering
-        filterset = BlogPostFilter(request.GET, queryset=posts)
-        posts = filterset.qs
+        # Apply filtering through the viewset's filter backends
+        posts = self.filter_queryset(posts)
         
         page = self.paginate_queryset(posts)
         if page is not None:
-            serializer = BlogPostListSerializer(page, many=True, context={'request': request})
+            serializer = self.get_serializer(page, many=True)
             return self.get_paginated_response(serializer.data)
         
-        serializer = BlogPostListSerializer(posts, many=True, context={'request': request})
+        serializer = self.get_serializer(posts, many=True)
         return Response(serializer.data)
     
     @action(detail=True, methods=['post'])
@@ -186,20 +274,16 @@ class BlogPostViewSet(viewsets.ModelViewSet):
         """
         post = self.get_object()
         
-        # Simple like system (in production, you'd want a separate Like model)
-        session_key = f'liked_post_{post.id}'
-        if request.session.get(session_key, False):
-            # Unlike
-            post.like_count = max(0, post.like_count - 1)
-            request.session[session_key] = False
-            action = 'unliked'
-        else:
-            # Like
-            post.like_count += 1
-            request.session[session_key] = True
-            action = 'liked'
-        
-        post.save(update_fields=['like_count'])
+        with transaction.atomic():
+            like, created = Like.objects.get_or_create(user=request.user, post=post)
+            if created:
+                post.increment_like_count()
+                action = 'liked'
+            else:
+                # Only the request that actually removed the like decrements
+                if Like.objects.filter(pk=like.pk).delete()[0]:
+                    post.decrement_like_count()
+                action = 'unliked'
         
         return Response({
             'action': action,
@@ -209,14 +293,21 @@ class BlogPostViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def popular(self, request):
         """
-        Get popular posts based on views and likes
+        Get popular posts based on views and likes, cached like the post list
         """
-        posts = BlogPost.objects.filter(
-            is_public=True,
-            status='published'
-        ).annotate(
-            popularity=Count('view_count') + Count('like_count')
-        ).order_by('-popularity')[:10]
-        
-        serializer = BlogPostListSerializer(posts, many=True, context={'request': request})
-        return Response(serializer.data)
\ No newline at end of file
+        key = POPULAR_POSTS_KEY_FORMAT % (post_list_version().timestamp(), request.get_full_path())
+        data = cache.get(key)
+        if data is None:
+            # popularity is kept up to date with the counts, so the top ten
+            # come straight off idx_popular_published_public
+            posts = with_list_counts(BlogPost.objects.filter(
+                is_public=True,
+                status='published'
+            ).select_related('author', 'category').defer(*LIST_DEFERRED_FIELDS)).order_by(
+                '-popularity', *BlogPost._meta.ordering
+            )[:10]
+            
+            serializer = BlogPostListSerializer(posts, many=True, context={'request': request})
+            data = serializer.data
+            cache.set(key, data, POST_LIST_TIMEOUT)
+        return Response(data)
\ No newline at end of file
@@ -11,9 +11,12 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 from pathlib import Path
+import importlib.util
+import logging
 import os
 from pathlib import Path
 from decouple import config
+from django.core.exceptions import ImproperlyConfigured
 from datetime import timedelta
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -71,6 +74,22 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# N+1 query detection in development (installed from requirements-dev.txt);
+# settings_test installs it whatever DEBUG is
+NPLUSONE_APP = 'nplusone.ext.django'
+NPLUSONE_MIDDLEWARE = 'nplusone.ext.django.NPlusOneMiddleware'
+NPLUSONE_LOGGER = logging.getLogger('nplusone')
+NPLUSONE_LOG_LEVEL = logging.WARNING
+# Tags prefetched with to_attr are read as a plain list, which nplusone
+# can't see being used
+NPLUSONE_WHITELIST = [
+    {'label': 'unused_eager_load', 'model': 'blog.BlogPost', 'field': 'prefetched_tags'},
+]
+
+if DEBUG and importlib.util.find_spec('nplusone'):
+    INSTALLED_APPS.append(NPLUSONE_APP)
+    MIDDLEWARE.insert(0, NPLUSONE_MIDDLEWARE)
+
 ROOT_URLCONF = 'blog_api.urls'
 
 TEMPLATES = [
@@ -102,6 +121,94 @@ DATABASES = {
 }
 
 
+# Cache
+# The default cache (REDIS_URL) only holds data that can be rebuilt, so it
+# may evict and be cleared. Download rate limits ('ratelimit') and post view
+# dedupe and buffered counts ('post_views') are state, kept in Redis at
+# REDIS_DURABLE_URL: a different database from REDIS_URL, so the default
+# cache's clear() (FLUSHDB) can't wipe them, on a server whose
+# maxmemory-policy is noeviction, as the policy is per server rather than per
+# database. Use a separate server if the default cache should evict.
+# AuthenticationConfig.ready() refuses to start without it while
+# SHARED_CACHES_REQUIRED is on.
+
+REDIS_URL = config('REDIS_URL', default='')
+REDIS_DURABLE_URL = config('REDIS_DURABLE_URL', default='')
+SHARED_CACHES_REQUIRED = not DEBUG
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        },
+    }
+
+if REDIS_DURABLE_URL:
+    CACHES.update({
+        'ratelimit': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_DURABLE_URL,
+            'KEY_PREFIX': 'ratelimit',
+            'TIMEOUT': None,
+        },
+        'post_views': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_DURABLE_URL,
+            'KEY_PREFIX': 'post_views',
+            'TIMEOUT': None,
+        },
+    })
+else:
+    # Per process, so limits are only enforced per worker; fine for runserver
+    CACHES.update({
+        'ratelimit': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'ratelimit',
+            'TIMEOUT': None,
+            # Well above the number of local users, so counters aren't culled
+            'OPTIONS': {'MAX_ENTRIES': 100000},
+        },
+        'post_views': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'post_views',
+            'TIMEOUT': None,
+            'OPTIONS': {'MAX_ENTRIES': 100000},
+        },
+    })
+
+# Post views are counted in the 'post_views' cache and written to the
+# database this many at a time (see BlogPost.record_view); 1 writes every view
+# straight away. Buffered views exist only in the cache until then, so this
+# needs REDIS_DURABLE_URL with persistence, and `manage.py flush_view_counts`
+# run periodically (and before shutting Redis down) to write partial batches.
+VIEW_COUNT_BATCH_SIZE = config('VIEW_COUNT_BATCH_SIZE', default=1, cast=int)
+
+if VIEW_COUNT_BATCH_SIZE > 1 and not REDIS_DURABLE_URL:
+    raise ImproperlyConfigured(
+        "VIEW_COUNT_BATCH_SIZE > 1 needs REDIS_DURABLE_URL: buffered views "
+        "would be lost with a per-process cache."
+    )
+
+
+# Password hashing
+# New hashes use Argon2; existing PBKDF2 hashes still verify and are
+# upgraded to Argon2 the next time the user logs in
+
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -154,7 +261,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # ===== DJANGO REST FRAMEWORK CONFIGURATION =====
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'authentication.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
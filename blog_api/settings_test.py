@@ -0,0 +1,44 @@
+# ===== blog_api/settings_test.py =====
+"""
+Settings for the test suite (selected in pytest.ini)
+"""
+from .settings import *  # noqa: F401,F403
+
+# The production hashers are deliberately slow; tests only need a hash
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+# Test databases live in memory (one per xdist worker), whatever DATABASES
+# points at, so commits never wait on the disk
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    }
+}
+
+# Every cache is local to the xdist worker, whatever REDIS_URL or DEBUG say:
+# tests clear() them freely, which on a shared Redis would FLUSHDB under the
+# other workers
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'ratelimit': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'ratelimit',
+        'TIMEOUT': None,
+    },
+    'post_views': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'post_views',
+        'TIMEOUT': None,
+    },
+}
+REDIS_URL = REDIS_DURABLE_URL = ''
+SHARED_CACHES_REQUIRED = False
+
+# The view tests raise on N+1 queries (NPLUSONE_RAISE), so nplusone is
+# installed even when DEBUG is off
+if NPLUSONE_APP not in INSTALLED_APPS:
+    INSTALLED_APPS = [*INSTALLED_APPS, NPLUSONE_APP]
+    MIDDLEWARE = [NPLUSONE_MIDDLEWARE, *MIDDLEWARE]
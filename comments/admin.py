@@ -31,9 +31,10 @@ class CommentAdmin(admin.ModelAdmin):
     post_title.short_description = 'Post'
     
     def is_reply(self, obj):
-        return obj.parent is not None
+        # parent_id is on the row; the parent itself isn't needed
+        return obj.parent_id is not None
     is_reply.boolean = True
     is_reply.short_description = 'Reply'
     
     def get_queryset(self, request):
-        return super().get_queryset(request).select_related('author', 'post', 'parent')
+        return super().get_queryset(request).select_related('author', 'post')
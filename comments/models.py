@@ -46,17 +46,37 @@ class Comment(models.Model):
     def __str__(self):
         return f"Comment by {self.author.username} on {self.post.title}"
     
+    # Content as last loaded or saved, for save()'s edit check
+    _loaded_content = None
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_content = instance.__dict__.get('content')
+        return instance
+    
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using, fields, **kwargs)
+        if fields is None or 'content' in fields:
+            self._loaded_content = self.__dict__.get('content')
+    
     def save(self, *args, **kwargs):
-        # Mark as edited if content is being updated
-        if self.pk:
-            original = Comment.objects.get(pk=self.pk)
-            if original.content != self.content:
-                self.is_edited = True
+        # Mark as edited if content changed since it was loaded, without
+        # re-reading the row; deferred content can't have changed
+        content = self.__dict__.get('content')
+        if self._loaded_content is not None and content is not None and content != self._loaded_content:
+            self.is_edited = True
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'is_edited'}
         
         super().save(*args, **kwargs)
+        if content is not None:
+            self._loaded_content = content
     
     def is_reply(self):
         return self.parent is not None
     
     def get_replies(self):
-        return Comment.objects.filter(parent=self)
\ No newline at end of file
+        # Through the reverse accessor, so prefetch_related('replies') is used
+        return self.replies.all()
\ No newline at end of file
@@ -1,6 +1,9 @@
 # comments/permissions.py
 from rest_framework import permissions
 
+# Set lookup instead of scanning DRF's tuple on every object check
+SAFE_METHODS = frozenset(permissions.SAFE_METHODS)
+
 class IsCommentAuthorOrReadOnly(permissions.BasePermission):
     """
     Custom permission to only allow authors of a comment to edit/delete it.
@@ -9,8 +12,9 @@ class IsCommentAuthorOrReadOnly(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         # Read permissions are allowed for any request,
         # so we'll always allow GET, HEAD or OPTIONS requests.
-        if request.method in permissions.SAFE_METHODS:
+        if request.method in SAFE_METHODS:
             return True
 
-        # Write permissions are only allowed to the author of the comment.
-        return obj.author == request.user
\ No newline at end of file
+        # Write permissions are only allowed to the author of the comment;
+        # comparing ids avoids loading obj.author.
+        return obj.author_id == request.user.pk
\ No newline at end of file
@@ -35,8 +35,11 @@ class CommentSerializer(serializers.ModelSerializer):
     
     def get_replies(self, obj):
         """Get nested replies (limited to 2 levels)"""
-        if obj.parent is None:  # Only get replies for top-level comments
-            replies = obj.replies.filter(is_approved=True).order_by('created_at')
+        if obj.parent_id is None:  # Only get replies for top-level comments
+            # Views prefetch these (comments.views.replies_prefetch)
+            replies = getattr(obj, 'approved_replies', None)
+            if replies is None:
+                replies = obj.replies.filter(is_approved=True).order_by('created_at')
             return CommentSerializer(replies, many=True, context=self.context).data
         return []
     
@@ -177,6 +177,27 @@ class CommentModelTest(TestCase):
         # is_edited should remain False
         self.assertFalse(comment.is_edited)
 
+    def test_comment_editing_tracking_without_refetch(self):
+        """Test that editing a loaded comment saves without re-reading it"""
+        comment = Comment.objects.get(pk=Comment.objects.create(**self.comment_data).pk)
+        comment.content = 'Updated comment content'
+        with self.assertNumQueries(1):
+            comment.save(update_fields=['content'])
+        
+        comment.refresh_from_db()
+        self.assertTrue(comment.is_edited)
+        self.assertEqual(comment.content, 'Updated comment content')
+
+    def test_comment_editing_tracking_deferred_content(self):
+        """Test that saving with deferred content leaves it unedited and unloaded"""
+        comment = Comment.objects.create(**self.comment_data)
+        comment = Comment.objects.defer('content').get(pk=comment.pk)
+        comment.is_approved = False
+        with self.assertNumQueries(1):
+            comment.save(update_fields=['is_approved'])
+        
+        self.assertFalse(Comment.objects.get(pk=comment.pk).is_edited)
+
     def test_comment_validation(self):
         """Test comment validation"""
         # Test required fields
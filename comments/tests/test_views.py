@@ -1,97 +1,93 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
 from django.urls import reverse
-from rest_framework.test import APITestCase, APIClient
+from rest_framework.test import APITestCase
 from rest_framework import status
-from rest_framework_simplejwt.tokens import RefreshToken
+from authentication.testing import JWTAuthMixin
 from blog.models import BlogPost, Category
 from ..models import Comment
 from ..serializers import CommentSerializer, CommentCreateSerializer
 
 User = get_user_model()
 
-class CommentViewsTest(APITestCase):
-	def setUp(self):
-		"""Set up test data"""
-		self.client = APIClient()
-		
+class CommentViewsTest(JWTAuthMixin, APITestCase):
+	@classmethod
+	def setUpTestData(cls):
+		"""Set up test data once for the whole class"""
 		# Create test users
-		self.user = User.objects.create_user(
+		cls.user = User.objects.create_user(
 			email='test@example.com',
 			username='testuser',
 			password='testpass123'
 		)
 		
-		self.other_user = User.objects.create_user(
+		cls.other_user = User.objects.create_user(
 			email='other@example.com',
 			username='otheruser',
 			password='otherpass123'
 		)
 		
-		self.admin_user = User.objects.create_superuser(
+		cls.admin_user = User.objects.create_superuser(
 			email='admin@example.com',
 			username='adminuser',
 			password='adminpass123'
 		)
 		
 		# Create test categories and posts
-		self.category = Category.objects.create(
+		cls.category = Category.objects.create(
 			name='Technology',
 			description='Technology related posts'
 		)
 		
-		self.post = BlogPost.objects.create(
+		cls.post = BlogPost.objects.create(
 			title='Test Blog Post',
 			content='This is a test blog post content.',
 			excerpt='Test excerpt',
-			author=self.user,
-			category=self.category,
+			author=cls.user,
+			category=cls.category,
 			is_public=True,
 			status=BlogPost.PUBLISHED,
 			meta_description='Test meta description',
 		)
 		
-		self.post2 = BlogPost.objects.create(
+		cls.post2 = BlogPost.objects.create(
 			title='Another Blog Post',
 			content='This is another blog post content.',
 			excerpt='Another excerpt',
-			author=self.other_user,
-			category=self.category,
+			author=cls.other_user,
+			category=cls.category,
 			is_public=True,
 			status=BlogPost.PUBLISHED,
 			meta_description='Another meta description',
 		)
 		
 		# Create test comments
-		self.comment = Comment.objects.create(
+		cls.comment = Comment.objects.create(
 			content='This is a test comment content.',
-			author=self.user,
-			post=self.post,
+			author=cls.user,
+			post=cls.post,
 		)
 		
-		self.reply_comment = Comment.objects.create(
+		cls.reply_comment = Comment.objects.create(
 			content='This is a reply comment content.',
-			author=self.other_user,
-			post=self.post,
-			parent=self.comment,
+			author=cls.other_user,
+			post=cls.post,
+			parent=cls.comment,
 		)
 		
-		self.other_post_comment = Comment.objects.create(
+		cls.other_post_comment = Comment.objects.create(
 			content='This is a comment on another post.',
-			author=self.user,
-			post=self.post2,
+			author=cls.user,
+			post=cls.post2,
 		)
 		
 		# Set up URLs
-		self.comment_list_url = reverse('comments:comments-list')
-		self.comment_detail_url = reverse('comments:comments-detail', kwargs={'pk': self.comment.pk})
-		self.reply_comment_detail_url = reverse('comments:comments-detail', kwargs={'pk': self.reply_comment.pk})
-		self.other_post_comment_detail_url = reverse('comments:comments-detail', kwargs={'pk': self.other_post_comment.pk})
-
-	def get_auth_headers(self, user):
-		"""Get authentication headers for a user"""
-		refresh = RefreshToken.for_user(user)
-		return {'HTTP_AUTHORIZATION': f'Bearer {refresh.access_token}'}
+		cls.comment_list_url = reverse('comments:comments-list')
+		cls.comment_detail_url = reverse('comments:comments-detail', kwargs={'pk': cls.comment.pk})
+		cls.reply_comment_detail_url = reverse('comments:comments-detail', kwargs={'pk': cls.reply_comment.pk})
+		cls.other_post_comment_detail_url = reverse('comments:comments-detail', kwargs={'pk': cls.other_post_comment.pk})
 
 	def test_comment_list_view_authenticated(self):
 		"""Test comment list view when authenticated"""
@@ -339,6 +335,22 @@ class CommentViewsTest(APITestCase):
 		# Since search isn't configured on viewset, just ensure we get a valid paginated response
 		self.assertIn('results', response.data)
 
+	def test_comment_by_post_query_count_is_constant(self):
+		"""Test that by_post's queries don't grow with comments or replies"""
+		url = reverse('comments:comments-by-post', kwargs={'post_id': self.post.pk})
+		self.client.credentials(**self.get_auth_headers(self.user))
+		with CaptureQueriesContext(connection) as before:
+			self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+		for i in range(3):
+			parent = Comment.objects.create(content=f'Top comment {i}', author=self.other_user, post=self.post)
+			Comment.objects.create(content=f'Reply {i}', author=self.user, post=self.post, parent=parent)
+		with CaptureQueriesContext(connection) as after:
+			response = self.client.get(url)
+		self.assertEqual(len(after), len(before))
+		replies = {c['content']: [r['content'] for r in c['replies']] for c in response.data['results']}
+		self.assertEqual(replies['Top comment 0'], ['Reply 0'])
+		self.assertEqual(replies['This is a test comment content.'], ['This is a reply comment content.'])
+
 	def test_comment_pagination(self):
 		"""Test comment pagination"""
 		self.client.credentials(**self.get_auth_headers(self.user))
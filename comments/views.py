@@ -5,12 +5,23 @@ from rest_framework.response import Response
 from rest_framework.throttling import ScopedRateThrottle
 from django_filters.rest_framework import DjangoFilterBackend
 from django.shortcuts import get_object_or_404
-from django.db.models import Q
+from django.db.models import Prefetch, Q
 from .models import Comment
 from .serializers import CommentSerializer, CommentCreateSerializer
 from .permissions import IsCommentAuthorOrReadOnly
 from blog.models import BlogPost
 
+def replies_prefetch():
+    """
+    Prefetch approved replies, with what CommentSerializer reads from them,
+    into approved_replies
+    """
+    return Prefetch(
+        'replies',
+        queryset=Comment.objects.filter(is_approved=True).select_related('author', 'post').order_by('created_at'),
+        to_attr='approved_replies'
+    )
+
 class CommentCreateThrottle(ScopedRateThrottle):
     """
     Custom throttle for comment creation
@@ -34,7 +45,7 @@ class CommentViewSet(viewsets.ModelViewSet):
         user = self.request.user
         return Comment.objects.filter(
             Q(is_approved=True) | Q(author=user)
-        ).select_related('author', 'post', 'parent')
+        ).select_related('author', 'post').prefetch_related(replies_prefetch())
     
     def get_serializer_class(self):
         """
@@ -71,7 +82,7 @@ class CommentViewSet(viewsets.ModelViewSet):
             post=post,
             parent=None,
             is_approved=True
-        ).select_related('author').order_by('created_at')
+        ).select_related('author', 'post').prefetch_related(replies_prefetch()).order_by('created_at')
         
         page = self.paginate_queryset(comments)
         if page is not None:
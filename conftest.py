@@ -0,0 +1,38 @@
+def pytest_addoption(parser):
+    parser.addoption(
+        '--max-test-duration',
+        type=float,
+        default=None,
+        metavar='SECONDS',
+        help="Fail the run if any test takes longer than SECONDS to run"
+    )
+
+
+class DurationBudget:
+    """
+    Fails the run when a test's call phase goes over budget. Under xdist the
+    workers' reports are replayed on the controller, so it sees every test.
+    """
+    def __init__(self, budget):
+        self.budget = budget
+        self.slow_tests = []
+
+    def pytest_runtest_logreport(self, report):
+        if report.when == 'call' and report.duration > self.budget:
+            self.slow_tests.append((report.duration, report.nodeid))
+
+    def pytest_sessionfinish(self, session):
+        if self.slow_tests:
+            session.exitstatus = 1
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.slow_tests:
+            terminalreporter.section('tests over %ss' % self.budget, red=True)
+            for duration, nodeid in sorted(self.slow_tests, reverse=True):
+                terminalreporter.write_line('%.2fs %s' % (duration, nodeid))
+
+
+def pytest_configure(config):
+    budget = config.getoption('max_test_duration')
+    if budget is not None and not hasattr(config, 'workerinput'):
+        config.pluginmanager.register(DurationBudget(budget), 'duration_budget')
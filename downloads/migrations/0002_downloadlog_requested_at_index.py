@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-15 22:51
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('downloads', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='downloadlog',
+            index=models.Index(fields=['requested_at'], name='downloads_d_request_f23295_idx'),
+        ),
+    ]
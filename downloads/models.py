@@ -51,6 +51,7 @@ class DownloadLog(models.Model):
     class Meta:
         ordering = ['-requested_at']
         indexes = [
+            models.Index(fields=['requested_at']),
             models.Index(fields=['user', 'requested_at']),
             models.Index(fields=['download_type', 'requested_at']),
         ]
@@ -42,11 +42,12 @@ class HistoricalPostsDownloadView(APIView):
         validated_data = serializer.validated_data
         user = request.user
         
-        # Security check: Rate limiting at user level
-        if not user.can_download():
+        # Security check: Rate limiting at user level. The download is
+        # counted now, before exporting, so parallel requests can't all pass
+        if not user.consume_download():
             return Response({
                 'error': 'Download rate limit exceeded. Please wait before requesting another download.',
-                'retry_after': 3600  # seconds
+                'retry_after': user.download_retry_after()  # seconds
             }, status=status.HTTP_429_TOO_MANY_REQUESTS)
         
         # Create download log entry
@@ -67,6 +68,7 @@ class HistoricalPostsDownloadView(APIView):
             max_records = 10000  # Adjust as needed
             if queryset.count() > max_records:
                 download_log.mark_failed(f"Too many records requested. Maximum allowed: {max_records}")
+                user.refund_download()
                 return Response({
                     'error': f'Too many records requested. Maximum allowed: {max_records}',
                     'requested_count': queryset.count()
@@ -101,6 +103,7 @@ class HistoricalPostsDownloadView(APIView):
         except Exception as e:
             logger.error(f"Download failed for user {user.username}: {str(e)}")
             download_log.mark_failed(str(e))
+            user.refund_download()
             return Response({
                 'error': 'Download failed. Please try again later.',
                 'request_id': str(download_log.request_id)